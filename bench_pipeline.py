@@ -0,0 +1,218 @@
+# bench_pipeline.py  —  önizleme hattının ekransız (Tk'sız) ölçümü
+#
+# PreviewWorker'ı sentetik kaynakla, tempo sınırı olmadan çalıştırır ve
+# yakalama -> küçültme -> dönüşüm -> imleç zincirini ölçer.
+#
+#   python bench_pipeline.py                      # tüm matris
+#   python bench_pipeline.py --sizes 4k --scales 0.5 --duration 3
+#   python bench_pipeline.py --out yeni.json --compare eski.json
+#   python bench_pipeline.py --sizes 1080p --engine thread process   # ayrı süreç karşılaştırması
+#   python bench_pipeline.py --sizes 4k --modes otomatik --fps 30 60  # bütçeye göre ön ayar seçimi
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import cv2
+
+import monitor_preview_tk as mp
+
+SIZES = {
+    "1080p": [(1920, 1080)],
+    "1440p": [(2560, 1440)],
+    "4k":    [(3840, 2160)],
+    "multi": [(1920, 1080), (2560, 1440), (1920, 1080)],  # ızgara modu
+}
+
+def drain(worker, seconds: float):
+    """Kareleri ölçmeden tüket."""
+    t_end = time.perf_counter() + seconds
+    while time.perf_counter() < t_end:
+        f = worker.mailbox.take()
+        if f:
+            f.release()
+        time.sleep(0.0005)
+
+def peak_memory(worker, warmup: float, seconds: float) -> int:
+    """Ayrı, süresi ölçülmeyen geçişte tepe bellek (bayt).
+
+    tracemalloc her ayırmayı yavaşlattığı için FPS/gecikme geçişinde kapalıdır.
+    Isınmada ayrılan tamponlar da sayılır; tepe, ısınmadan sonra sıfırlanır.
+    """
+    tracemalloc.start()
+    worker.start()
+    try:
+        drain(worker, warmup)
+        tracemalloc.reset_peak()
+        drain(worker, seconds)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        worker.stop()
+        worker.join(timeout=5)
+    return peak
+
+class HeadlessView:
+    """Worker'ın beklediği tek UI alanı: yayınlanan tuval boyutu."""
+    def __init__(self, canvas_size=(0, 0)):
+        self.canvas_size = canvas_size
+
+def run_case(size_key: str, scale: float, mode: str, cursor: bool, motion: str,
+             duration: float, canvas, pipeline_workers: int, roi=None,
+             engine: str = "thread", fps: int = 1000) -> dict:
+    sizes = SIZES[size_key]
+    indices = tuple(range(1, len(sizes) + 1)) if len(sizes) > 1 else None
+    profiler = mp.PipelineProfiler(enabled=True)
+    config = mp.PreviewConfig(
+        monitor_idx=1, scale=scale, fps=fps,   # 1000 FPS: tempo sınırı yok
+        show_cursor=cursor, resize_mode=mode, pipeline_workers=pipeline_workers,
+        monitor_indices=indices,
+        roi_mode="imleci takip" if roi else "kapalı", roi_size=roi or (640, 360))
+
+    def make_worker(profiler):
+        if engine == "process":
+            # alt süreç kendi sentetik kaynağını kurar; aşama süreleri durum
+            # mesajlarıyla bu profilciye gelir
+            return mp.ProcessCaptureWorker(
+                HeadlessView(canvas), "synthetic", {"sizes": sizes, "motion": motion},
+                config=config, profiler=profiler)
+        return mp.PreviewWorker(HeadlessView(canvas),
+                                source=mp.SyntheticCapture(sizes=sizes, motion=motion),
+                                profiler=profiler, **config.as_dict())
+
+    warmup = 2.0 if engine == "process" else 0.3
+    worker = make_worker(profiler)
+    latencies = []
+    worker.start()
+    # ısınma: ilk kare tam işleme + tampon ayırma (alt süreçte süreç açılışı da)
+    drain(worker, warmup)
+    start_presented = worker.mailbox.presented
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < duration:
+        f = worker.mailbox.take()
+        if f is not None:
+            latencies.append((time.perf_counter() - f.ts) * 1000.0)
+            worker.mailbox.presented += 1
+            f.release()
+        else:
+            time.sleep(0.0005)
+    elapsed = time.perf_counter() - t0
+    worker.stop()
+    worker.join(timeout=5)
+    if worker.error:
+        raise RuntimeError(worker.error)
+    # tracemalloc yalnızca bu süreci görür; süreç motorunda asıl iş alt süreçte
+    # olduğundan ölçüm anlamsız olur (N/A)
+    peak = (None if engine == "process"
+            else peak_memory(make_worker(mp.PipelineProfiler()), warmup, min(duration, 0.5)))
+
+    frames = worker.mailbox.presented - start_presented
+    stages = {k: round(v["p50"], 3) for k, v in profiler.stats()["stages"].items()}
+    resizer = getattr(worker, "resizer", None)   # süreç motorunda seçim alt süreçte kalır
+    return {
+        "size": size_key, "scale": scale, "mode": mode, "cursor": cursor,
+        "motion": motion, "pipeline_workers": pipeline_workers, "engine": engine,
+        # ızgara ve ROI ardışık düzeni kapatır (PreviewConfig.pipelined)
+        "pipelined": config.pipelined(),
+        "target_fps": fps, "resize_active": resizer.active if resizer else None,
+        "roi": "x".join(map(str, roi)) if roi else None,
+        "fps": round(frames / elapsed, 2),
+        "latency_ms": {"p50": round(mp.percentile(latencies, 50), 3),
+                       "p95": round(mp.percentile(latencies, 95), 3),
+                       "p99": round(mp.percentile(latencies, 99), 3)},
+        "peak_mem_mb": round(peak / 1e6, 2) if peak is not None else None,
+        "dropped": worker.mailbox.dropped,
+        "capture_dropped": worker.mailbox.capture_dropped,
+        "stage_p50_ms": stages,
+    }
+
+def case_key(r: dict) -> tuple:
+    return (r["size"], r["scale"], r["mode"], r["cursor"], r["motion"],
+            r["pipeline_workers"], r.get("roi"), r.get("engine", "thread"),
+            r.get("target_fps", 1000))
+
+def compare(results, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        base = {case_key(r): r for r in json.load(f)["results"]}
+    print("\nkarşılaştırma (fps değişimi):")
+    for r in results:
+        b = base.get(case_key(r))
+        if not b or not b["fps"]:
+            continue
+        delta = (r["fps"] - b["fps"]) / b["fps"] * 100.0
+        print(f"  {fmt_case(r):<48} {b['fps']:>8.1f} -> {r['fps']:>8.1f}  ({delta:+.1f}%)")
+
+def fmt_case(r: dict) -> str:
+    mode = r["mode"]
+    if mode == "otomatik" and r.get("resize_active"):
+        mode += f"->{r['resize_active']}"
+    return (f"{r['size']} x{r['scale']} {mode} "
+            f"cursor={'on' if r['cursor'] else 'off'} {r['motion']}"
+            + (f" pipe={r['pipeline_workers']}" if r["pipeline_workers"] else "")
+            + (" (kapalı)" if r["pipeline_workers"] and r.get("pipelined") is False else "")
+            + (f" roi={r['roi']}" if r.get("roi") else "")
+            + (" süreç" if r.get("engine") == "process" else "")
+            + (f" @{r['target_fps']}" if r.get("target_fps", 1000) != 1000 else ""))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Önizleme hattı için ekransız ölçüm")
+    ap.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    ap.add_argument("--scales", nargs="+", type=float, default=[0.25, 0.5])
+    ap.add_argument("--modes", nargs="+", choices=mp.RESIZE_MODES, default=mp.RESIZE_MODES)
+    ap.add_argument("--cursor", nargs="+", choices=["on", "off"], default=["on", "off"])
+    ap.add_argument("--motion", nargs="+", choices=["full", "box", "static"], default=["full"])
+    ap.add_argument("--pipeline", nargs="+", type=int, default=[0],
+                    help="işleme thread sayısı (0 = tek thread)")
+    ap.add_argument("--canvas", type=mp.parse_size, default=None, metavar="WxH",
+                    help="tuval sınırı (varsayılan: yalnızca ölçek)")
+    ap.add_argument("--roi", type=mp.parse_size, default=None, metavar="WxH",
+                    help="imleci takip eden bölge yakalama (ROI) boyutu")
+    ap.add_argument("--engine", nargs="+", choices=["thread", "process"], default=["thread"],
+                    help="process: yakalama alt süreçte, kareler paylaşımlı bellek halkasından")
+    ap.add_argument("--fps", nargs="+", type=int, default=[1000],
+                    help="hedef FPS (1000 = tempo sınırı yok); otomatik kalite bu bütçeye göre seçer")
+    ap.add_argument("--duration", type=float, default=1.5, help="durum başına saniye")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", metavar="JSON", help="önceki sonuç dosyası")
+    args = ap.parse_args(argv)
+
+    results = []
+    for size_key in args.sizes:
+        for scale in args.scales:
+            for mode in args.modes:
+                for cur in args.cursor:
+                    for motion in args.motion:
+                        for pw in args.pipeline:
+                            for engine in args.engine:
+                                for fps in args.fps:
+                                    r = run_case(size_key, scale, mode, cur == "on", motion,
+                                                 args.duration, args.canvas or (0, 0), pw,
+                                                 args.roi, engine, fps)
+                                    results.append(r)
+                                    lat = r["latency_ms"]
+                                    peak = r["peak_mem_mb"]
+                                    print(f"{fmt_case(r):<48} {r['fps']:>8.1f} fps  "
+                                          f"lat p50/p95/p99 {lat['p50']:.1f}/{lat['p95']:.1f}/"
+                                          f"{lat['p99']:.1f} ms  peak "
+                                          + (f"{peak:.1f} MB" if peak is not None else "N/A"))
+
+    meta = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0], "platform": platform.platform(),
+        "numpy": np.__version__, "cv2": cv2.__version__,
+        "cpus": os.cpu_count(), "duration_s": args.duration,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"\nsonuçlar: {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    mp.multiprocessing.freeze_support()
+    main()
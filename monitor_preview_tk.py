@@ -1,490 +1,3481 @@
-import threading
-import time
-import ctypes
-import ctypes.wintypes as wintypes
-import tkinter as tk
-from tkinter import ttk, messagebox, colorchooser
-from typing import Optional, List, Dict, Tuple
-
-import mss
-import numpy as np
-import cv2
-from PIL import Image, ImageTk
-
-# --- Windows API / pywin32 (opsiyonel ama önerilir) --------------------------
-try:
-    import win32con, win32gui, win32api
-    HAS_WIN32 = True
-except Exception:
-    HAS_WIN32 = False
-
-APP_TITLE = "CANMOSE TV/Monitör Önizleme"
-
-# --- DPI AWARENESS ------------------------------------------------------------
-user32 = ctypes.windll.user32 if hasattr(ctypes, "windll") else None
-shcore = ctypes.windll.shcore if hasattr(ctypes, "windll") else None
-
-DPI_AWARE_CTX_PER_MONITOR_V2 = ctypes.c_void_p(-4).value  # PER_MONITOR_AWARE_V2
-MDT_EFFECTIVE_DPI = 0
-MONITOR_DEFAULTTONEAREST = 2
-
-class POINT(ctypes.Structure):
-    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-def make_process_dpi_aware():
-    if not user32:
-        return
-    try:
-        user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(DPI_AWARE_CTX_PER_MONITOR_V2))
-    except Exception:
-        try:
-            if shcore:
-                shcore.SetProcessDpiAwareness(2)  # PER_MONITOR_AWARE
-        except Exception:
-            try:
-                user32.SetProcessDPIAware()
-            except Exception:
-                pass
-
-def get_system_scale_factor() -> float:
-    if user32 and hasattr(user32, "GetDpiForSystem"):
-        try:
-            dpi = user32.GetDpiForSystem()
-            return dpi / 96.0
-        except Exception:
-            pass
-    return 1.0
-
-def monitor_from_point(px: int, py: int):
-    if not user32:
-        return None
-    pt = POINT(px, py)
-    return user32.MonitorFromPoint(pt, MONITOR_DEFAULTTONEAREST)
-
-def get_dpi_for_monitor(hmon) -> float:
-    if not shcore:
-        return get_system_scale_factor()
-    dpiX = wintypes.UINT()
-    dpiY = wintypes.UINT()
-    try:
-        hr = shcore.GetDpiForMonitor(hmon, MDT_EFFECTIVE_DPI,
-                                     ctypes.byref(dpiX), ctypes.byref(dpiY))
-        if hr == 0 and dpiX.value:
-            return float(dpiX.value) / 96.0
-    except Exception:
-        pass
-    return get_system_scale_factor()
-
-def try_get_physical_cursor_pos() -> Optional[Tuple[int,int]]:
-    if user32 and hasattr(user32, "GetPhysicalCursorPos"):
-        pt = POINT()
-        if user32.GetPhysicalCursorPos(ctypes.byref(pt)):
-            return (pt.x, pt.y)
-    return None
-
-def get_physical_cursor_pos_robust() -> Tuple[int,int,dict]:
-    """Fiziksel piksel koordinatı döndür (DPI sağlam) + debug meta."""
-    meta = {"method": "", "scale": None}
-    phys = try_get_physical_cursor_pos()
-    if phys:
-        meta["method"] = "GetPhysicalCursorPos"
-        meta["scale"] = 1.0
-        return phys[0], phys[1], meta
-
-    if HAS_WIN32:
-        x_log, y_log = win32api.GetCursorPos()
-        hmon = monitor_from_point(x_log, y_log)
-        scale = get_dpi_for_monitor(hmon) if hmon else get_system_scale_factor()
-        x = int(round(x_log * scale))
-        y = int(round(y_log * scale))
-        meta["method"] = "GetCursorPos * per-monitor DPI"
-        meta["scale"] = scale
-        return x, y, meta
-
-    return 0, 0, {"method": "none", "scale": None}
-
-# --- yardımcılar --------------------------------------------------------------
-def list_monitors() -> List[Dict]:
-    with mss.mss() as sct:
-        return sct.monitors  # [0]=tüm, 1..N=tek tek
-
-def monitors_to_options(monitors: List[Dict]) -> List[str]:
-    opts = []
-    for idx, m in enumerate(monitors):
-        if idx == 0:
-            label = f"[0] Tüm Ekranlar  {m['width']}x{m['height']}"
-        else:
-            label = f"[{idx}] Monitör {idx}  {m['width']}x{m['height']} @({m['left']},{m['top']})"
-        opts.append(label)
-    return opts
-
-def parse_monitor_index(text: str) -> int:
-    try:
-        return int(text.split("]")[0].strip("["))
-    except Exception:
-        return 1
-
-def set_window_topmost(root: tk.Tk, enable: bool):
-    root.wm_attributes("-topmost", 1 if enable else 0)
-    if HAS_WIN32:
-        try:
-            hwnd = win32gui.FindWindow(None, root.title())
-            if hwnd:
-                flag = win32con.HWND_TOPMOST if enable else win32con.HWND_NOTOPMOST
-                win32gui.SetWindowPos(
-                    hwnd, flag, 0, 0, 0, 0,
-                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE
-                )
-        except Exception:
-            pass
-
-def hex_to_bgr(hex_color: str) -> Tuple[int,int,int]:
-    """'#RRGGBB' -> (B, G, R)"""
-    hex_color = hex_color.strip()
-    if hex_color.startswith("#"):
-        hex_color = hex_color[1:]
-    if len(hex_color) != 6:
-        return (0, 0, 255)  # default red
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-    return (b, g, r)
-
-# --- worker thread ------------------------------------------------------------
-class PreviewWorker(threading.Thread):
-    def __init__(self, ui, monitor_idx: int, scale: float, fps: int,
-                 show_cursor: bool, debug: bool,
-                 arrow_len: int, arrow_dir: str, arrow_color_bgr: Tuple[int,int,int],
-                 anchor_mode: str, arrow_offset: int):
-        super().__init__(daemon=True)
-        self.ui = ui
-        self.monitor_idx = monitor_idx
-        self.scale = scale
-        self.fps = max(1, int(fps))
-        self.show_cursor = show_cursor
-        self.debug = debug
-        self.arrow_len = int(arrow_len)
-        self.arrow_dir = arrow_dir
-        self.arrow_color_bgr = arrow_color_bgr
-        self.anchor_mode = anchor_mode
-        self.arrow_offset = int(arrow_offset)
-        self._stop = threading.Event()
-
-    def stop(self):
-        self._stop.set()
-
-    def run(self):
-        frame_interval = 1.0 / self.fps
-        prev_time = 0.0
-        try:
-            with mss.mss() as sct:
-                monitors = sct.monitors
-                if self.monitor_idx < 0 or self.monitor_idx >= len(monitors):
-                    self.ui.on_worker_stopped("Geçersiz monitör index")
-                    return
-                mon = monitors[self.monitor_idx]
-                L, T, W, H = mon["left"], mon["top"], mon["width"], mon["height"]
-
-                while not self._stop.is_set():
-                    now = time.time()
-                    if now - prev_time < frame_interval:
-                        time.sleep(max(0, frame_interval - (now - prev_time)))
-                    prev_time = time.time()
-
-                    # --- yakalama (BGRA) -> BGR ve contiguous/yazılabilir ---
-                    img = np.asarray(sct.grab(mon))
-                    frame = img[:, :, :3].copy()
-                    frame = np.ascontiguousarray(frame, dtype=np.uint8)
-
-                    dbg_text = ""
-                    # --- imleç ok çizimi ---
-                    if HAS_WIN32 and self.show_cursor:
-                        try:
-                            cx_phys, cy_phys, meta = get_physical_cursor_pos_robust()
-                            inside = (L <= cx_phys < L + W) and (T <= cy_phys < T + H)
-                            cx = cx_phys - L
-                            cy = cy_phys - T
-
-                            if not inside:
-                                # yedek: ham mantıksal
-                                x_raw, y_raw = win32api.GetCursorPos()
-                                if (L <= x_raw < L + W) and (T <= y_raw < T + H):
-                                    cx = x_raw - L
-                                    cy = y_raw - T
-                                    inside = True
-                                    meta["method"] += " | fallback raw"
-
-                            if inside:
-                                cx = int(cx); cy = int(cy)
-                                # 1) yön vektörü
-                                d = self.arrow_dir
-                                vx, vy = 0, 0
-                                if d == "sağ":                  vx, vy =  1,  0
-                                elif d == "sol":               vx, vy = -1,  0
-                                elif d == "yukarı":            vx, vy =  0, -1
-                                elif d == "aşağı":             vx, vy =  0,  1
-                                elif d == "çapraz sağ-aşağı":  vx, vy =  1,  1
-                                elif d == "çapraz sol-aşağı":  vx, vy = -1,  1
-                                elif d == "çapraz sağ-yukarı": vx, vy =  1, -1
-                                elif d == "çapraz sol-yukarı": vx, vy = -1, -1
-
-                                # normalize
-                                length = max(1.0, (vx*vx + vy*vy)**0.5)
-                                ux, uy = vx/length, vy/length
-
-                                # 2) toplam uzunluk = arrow_len + offset
-                                base_len = max(5, int(self.arrow_len))
-                                total_len = base_len + int(self.arrow_offset)
-
-                                # 3) anchor modu
-                                if self.anchor_mode == "uçtan dışarı çiz":
-                                    # başlangıç imleçte, uç dışarı
-                                    x1 = cx
-                                    y1 = cy
-                                    x2 = int(np.clip(cx + ux*total_len, 0, frame.shape[1]-1))
-                                    y2 = int(np.clip(cy + uy*total_len, 0, frame.shape[0]-1))
-                                else:
-                                    # "dışarıdan uca çiz": okun ucu imleçte biter
-                                    x2 = cx
-                                    y2 = cy
-                                    x1 = int(np.clip(cx - ux*total_len, 0, frame.shape[1]-1))
-                                    y1 = int(np.clip(cy - uy*total_len, 0, frame.shape[0]-1))
-
-                                # 4) çiz
-                                cv2.arrowedLine(
-                                    frame, (x1, y1), (x2, y2),
-                                    color=self.arrow_color_bgr, thickness=2,
-                                    line_type=cv2.LINE_AA, tipLength=0.35
-                                )
-
-                            if self.debug:
-                                dbg_text = (f"CUR:{cx_phys},{cy_phys} method={meta.get('method')} "
-                                            f"MON:[{L},{T},{W},{H}] inside={inside} "
-                                            f"anchor={self.anchor_mode} off={self.arrow_offset}")
-                        except Exception as e:
-                            if self.debug:
-                                dbg_text = f"cursor_err:{e}"
-
-                    # --- RGB'ye çevir, PIL image oluştur ---
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    image = Image.fromarray(frame_rgb)
-
-                    # Canvas'a sığdır
-                    canvas_w = self.ui.canvas.winfo_width()
-                    canvas_h = self.ui.canvas.winfo_height()
-                    if canvas_w > 0 and canvas_h > 0:
-                        image.thumbnail((canvas_w, canvas_h), Image.LANCZOS)
-
-                    photo = ImageTk.PhotoImage(image)
-                    self.ui.root.after(0, self.ui.update_frame, photo)
-
-                    if self.debug:
-                        self.ui.root.after(0, self.ui.set_status, f"DEBUG: {dbg_text}")
-
-        except Exception as e:
-            self.ui.on_worker_stopped(f"Hata: {e}")
-
-# --- GUI ----------------------------------------------------------------------
-class App:
-    def __init__(self, root: tk.Tk):
-        self.root = root
-        root.title(APP_TITLE)
-        root.geometry("1120x680")
-        root.minsize(860, 520)
-
-        self.worker: Optional[PreviewWorker] = None
-        self.is_running = False
-        self.photo_ref = None
-
-        # ÜST PANEL
-        top = ttk.Frame(root, padding=8)
-        top.pack(side=tk.TOP, fill=tk.X)
-
-        ttk.Label(top, text="Monitör:").pack(side=tk.LEFT, padx=(0,6))
-        self.monitors = list_monitors()
-        self.monitor_opts = monitors_to_options(self.monitors)
-        default_val = self.monitor_opts[1] if len(self.monitor_opts) > 1 else self.monitor_opts[0]
-        self.monitor_var = tk.StringVar(value=default_val)
-        self.monitor_combo = ttk.Combobox(top, values=self.monitor_opts,
-                                          textvariable=self.monitor_var, state="readonly", width=48)
-        self.monitor_combo.pack(side=tk.LEFT)
-        ttk.Button(top, text="Yenile", command=self.refresh_monitors).pack(side=tk.LEFT, padx=6)
-
-        ttk.Label(top, text="Ölçek:").pack(side=tk.LEFT, padx=(10,6))
-        self.scale_var = tk.DoubleVar(value=0.5)
-        ttk.Spinbox(top, from_=0.1, to=1.5, increment=0.05,
-                    textvariable=self.scale_var, width=6).pack(side=tk.LEFT)
-
-        ttk.Label(top, text="FPS:").pack(side=tk.LEFT, padx=(10,6))
-        self.fps_var = tk.IntVar(value=30)
-        ttk.Spinbox(top, values=(15,20,24,30,45,60),
-                    textvariable=self.fps_var, width=6).pack(side=tk.LEFT)
-
-        self.topmost_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(top, text="Hep üstte",
-                        variable=self.topmost_var, command=self.on_topmost).pack(side=tk.LEFT, padx=(10,6))
-
-        self.cursor_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(top, text="İmleci Göster",
-                        variable=self.cursor_var).pack(side=tk.LEFT, padx=(6,6))
-
-        self.debug_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(top, text="Debug",
-                        variable=self.debug_var).pack(side=tk.LEFT)
-
-        # ORTA PANEL — OK AYARLARI
-        mid = ttk.Frame(root, padding=(8,0,8,8))
-        mid.pack(side=tk.TOP, fill=tk.X)
-
-        ttk.Label(mid, text="Ok Boyu:").pack(side=tk.LEFT)
-        self.arrow_len_var = tk.IntVar(value=24)
-        ttk.Spinbox(mid, from_=8, to=200, increment=2,
-                    textvariable=self.arrow_len_var, width=6).pack(side=tk.LEFT, padx=(6,12))
-
-        ttk.Label(mid, text="Ok Yönü:").pack(side=tk.LEFT)
-        self.arrow_dir_var = tk.StringVar(value="sağ")
-        ttk.Combobox(mid, textvariable=self.arrow_dir_var, state="readonly",
-                     values=["sağ","sol","yukarı","aşağı",
-                             "çapraz sağ-aşağı","çapraz sol-aşağı",
-                             "çapraz sağ-yukarı","çapraz sol-yukarı"],
-                     width=18).pack(side=tk.LEFT, padx=(6,12))
-
-        ttk.Label(mid, text="Bağlantı:").pack(side=tk.LEFT)
-        self.anchor_mode_var = tk.StringVar(value="dışarıdan uca çiz")
-        ttk.Combobox(mid, textvariable=self.anchor_mode_var, state="readonly",
-                     values=["uçtan dışarı çiz", "dışarıdan uca çiz"],
-                     width=18).pack(side=tk.LEFT, padx=(6,12))
-
-        ttk.Label(mid, text="Ofset:").pack(side=tk.LEFT)
-        self.arrow_offset_var = tk.IntVar(value=0)
-        ttk.Spinbox(mid, from_=-60, to=120, increment=2,
-                    textvariable=self.arrow_offset_var, width=6).pack(side=tk.LEFT, padx=(6,12))
-
-        ttk.Label(mid, text="Ok Rengi:").pack(side=tk.LEFT)
-        self.arrow_color_hex = tk.StringVar(value="#FF0000")  # kırmızı
-        self.color_btn = ttk.Button(mid, text="Renk Seç", command=self.pick_color)
-        self.color_btn.pack(side=tk.LEFT, padx=(6,6))
-        self.color_preview = tk.Canvas(mid, width=28, height=18, bg="#FF0000",
-                                       highlightthickness=1, highlightbackground="#888")
-        self.color_preview.pack(side=tk.LEFT)
-
-        # BUTONLAR
-        btns = ttk.Frame(root, padding=(8,0,8,8))
-        btns.pack(side=tk.TOP, fill=tk.X)
-        self.start_btn = ttk.Button(btns, text="Önizlemeyi Başlat", command=self.start_preview)
-        self.stop_btn  = ttk.Button(btns,  text="Durdur",            command=self.stop_preview, state=tk.DISABLED)
-        self.start_btn.pack(side=tk.LEFT)
-        self.stop_btn.pack(side=tk.LEFT, padx=6)
-
-        # ÖNİZLEME
-        self.canvas = tk.Canvas(root, bg="black")
-        self.canvas.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0,8))
-
-        # STATUS
-        self.status_var = tk.StringVar(value="Hazır")
-        ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor="w")\
-            .pack(side=tk.BOTTOM, fill=tk.X)
-
-        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
-
-    # ---- GUI event handlers ----
-    def pick_color(self):
-        color = colorchooser.askcolor(color=self.arrow_color_hex.get(), title="Ok Rengini Seç")
-        if color and color[1]:
-            self.arrow_color_hex.set(color[1])
-            self.color_preview.configure(bg=color[1])
-
-    def refresh_monitors(self):
-        try:
-            self.monitors = list_monitors()
-            self.monitor_opts = monitors_to_options(self.monitors)
-            self.monitor_combo["values"] = self.monitor_opts
-            self.monitor_var.set(self.monitor_opts[1] if len(self.monitor_opts) > 1 else self.monitor_opts[0])
-            self.set_status("Monitör listesi yenilendi.")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Monitörler alınamadı: {e}")
-
-    def on_topmost(self):
-        set_window_topmost(self.root, self.topmost_var.get())
-
-    def start_preview(self):
-        if self.is_running:
-            return
-        try:
-            mon_idx = parse_monitor_index(self.monitor_var.get())
-            scale   = float(self.scale_var.get())
-            fps     = int(self.fps_var.get())
-            show_cursor = bool(self.cursor_var.get())
-            debug = bool(self.debug_var.get())
-            arrow_len = int(self.arrow_len_var.get())
-            arrow_dir = self.arrow_dir_var.get()
-            anchor_mode = self.anchor_mode_var.get()
-            arrow_offset = int(self.arrow_offset_var.get())
-            arrow_color_bgr = hex_to_bgr(self.arrow_color_hex.get())
-
-            if not (0.1 <= scale <= 1.5):
-                raise ValueError("Ölçek 0.1–1.5 arası olmalı.")
-
-            self.worker = PreviewWorker(
-                self, mon_idx, scale, fps,
-                show_cursor, debug,
-                arrow_len, arrow_dir, arrow_color_bgr,
-                anchor_mode, arrow_offset
-            )
-            self.worker.start()
-            self.is_running = True
-            self.start_btn.config(state=tk.DISABLED)
-            self.stop_btn.config(state=tk.NORMAL)
-            self.set_status(f"Önizleme başladı (Monitör {mon_idx}, ölçek {scale}, {fps} FPS).")
-        except Exception as e:
-            messagebox.showerror("Başlatma Hatası", str(e))
-
-    def stop_preview(self):
-        if self.worker:
-            self.worker.stop()
-        self.is_running = False
-        self.start_btn.config(state=tk.NORMAL)
-        self.stop_btn.config(state=tk.DISABLED)
-        self.set_status("Önizleme durduruldu.")
-
-    def update_frame(self, photo: ImageTk.PhotoImage):
-        self.photo_ref = photo  # GC koruması
-        self.canvas.delete("all")
-        w = self.canvas.winfo_width()
-        h = self.canvas.winfo_height()
-        img_w = photo.width()
-        img_h = photo.height()
-        x = (w - img_w) // 2 if w > img_w else 0
-        y = (h - img_h) // 2 if h > img_h else 0
-        self.canvas.create_image(x, y, anchor="nw", image=photo)
-
-    def on_worker_stopped(self, reason: str):
-        self.stop_preview()
-        if reason:
-            self.set_status(f"Önizleme sonlandı: {reason}")
-
-    def set_status(self, text: str):
-        self.status_var.set(text)
-
-    def on_close(self):
-        try:
-            if self.worker:
-                self.worker.stop()
-        except Exception:
-            pass
-        self.root.destroy()
-
-# --- main ---------------------------------------------------------------------
-def main():
-    make_process_dpi_aware()
-    root = tk.Tk()
-    try:
-        from tkinter import font as tkfont
-        tkfont.nametofont("TkDefaultFont").configure(size=10)
-    except Exception:
-        pass
-    app = App(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-    main()
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import queue
+import json
+import base64
+import hashlib
+import struct
+import ctypes
+import ctypes.wintypes as wintypes
+import multiprocessing
+import tkinter as tk
+from tkinter import ttk, messagebox, colorchooser, filedialog
+from typing import Optional, List, Dict, Tuple
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+
+# --- ağır bağımlılıklar (gecikmeli yükleme) ------------------------------------
+# numpy/cv2/PIL/mss içe aktarımı açılışın çoğunu oluşturur. Pencere önce
+# gösterilir, modüller ilk kullanımda (ya da App'in arka plan thread'inde)
+# yüklenir. Yer tutucular yüklemeden sonra gerçek modüllerle değiştirilir,
+# böylece sıcak yolda ek dolaylama kalmaz.
+class _Deferred:
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        load_dependencies()
+        return getattr(globals()[self._name], attr)
+
+np = _Deferred("np")
+cv2 = _Deferred("cv2")
+mss = _Deferred("mss")
+Image = _Deferred("Image")
+ImageTk = _Deferred("ImageTk")
+_deps_lock = threading.Lock()
+_deps_loaded = False
+
+def load_dependencies():
+    """numpy, cv2, PIL ve mss'i yükle (tekrar çağrılırsa hemen döner)."""
+    global np, cv2, mss, Image, ImageTk, _deps_loaded
+    if _deps_loaded:
+        return
+    with _deps_lock:
+        if _deps_loaded:
+            return
+        import numpy as np
+        import cv2
+        import mss
+        from PIL import Image, ImageTk
+        _deps_loaded = True
+
+# --- Windows API / pywin32 (opsiyonel ama önerilir) --------------------------
+try:
+    import win32con, win32gui, win32api
+    HAS_WIN32 = True
+except Exception:
+    HAS_WIN32 = False
+
+APP_TITLE = "CANMOSE TV/Monitör Önizleme"
+
+# --- DPI AWARENESS ------------------------------------------------------------
+user32 = ctypes.windll.user32 if hasattr(ctypes, "windll") else None
+shcore = ctypes.windll.shcore if hasattr(ctypes, "windll") else None
+
+DPI_AWARE_CTX_PER_MONITOR_V2 = ctypes.c_void_p(-4).value  # PER_MONITOR_AWARE_V2
+MDT_EFFECTIVE_DPI = 0
+
+class POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+def make_process_dpi_aware():
+    if not user32:
+        return
+    try:
+        user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(DPI_AWARE_CTX_PER_MONITOR_V2))
+    except Exception:
+        try:
+            if shcore:
+                shcore.SetProcessDpiAwareness(2)  # PER_MONITOR_AWARE
+        except Exception:
+            try:
+                user32.SetProcessDPIAware()
+            except Exception:
+                pass
+
+def get_system_scale_factor() -> float:
+    if user32 and hasattr(user32, "GetDpiForSystem"):
+        try:
+            dpi = user32.GetDpiForSystem()
+            return dpi / 96.0
+        except Exception:
+            pass
+    return 1.0
+
+def get_dpi_for_monitor(hmon) -> float:
+    if not shcore:
+        return get_system_scale_factor()
+    dpiX = wintypes.UINT()
+    dpiY = wintypes.UINT()
+    try:
+        hr = shcore.GetDpiForMonitor(hmon, MDT_EFFECTIVE_DPI,
+                                     ctypes.byref(dpiX), ctypes.byref(dpiY))
+        if hr == 0 and dpiX.value:
+            return float(dpiX.value) / 96.0
+    except Exception:
+        pass
+    return get_system_scale_factor()
+
+VK_LBUTTON, VK_RBUTTON = 0x01, 0x02
+if user32:
+    user32.GetAsyncKeyState.restype = ctypes.c_short
+
+def mouse_button_down() -> bool:
+    """Sol ya da sağ fare tuşu şu an basılı mı (Win32 yoksa hep False)."""
+    if not user32:
+        return False
+    return bool((user32.GetAsyncKeyState(VK_LBUTTON) | user32.GetAsyncKeyState(VK_RBUTTON)) & 0x8000)
+
+def get_physical_cursor_pos_robust() -> Tuple[int,int,dict]:
+    """Fiziksel piksel koordinatı döndür (DPI sağlam) + debug meta."""
+    x, y, method, scale, _logical = GEOMETRY.cursor()
+    return x, y, {"method": method, "scale": scale}
+
+# --- monitör / DPI geometrisi (önbellekli) ------------------------------------
+
+# (sol, üst, sağ, alt, ölçek) — mantıksal koordinatlarda monitör tablosu
+MonitorTable = List[Tuple[int, int, int, int, float]]
+
+def map_logical_to_physical(x: int, y: int, table: MonitorTable,
+                            default_scale: float = 1.0) -> Tuple[int, int, float]:
+    """Mantıksal noktayı bulunduğu monitörün DPI ölçeğiyle fiziksele çevir (saf Python)."""
+    scale = default_scale
+    for left, top, right, bottom, s in table:
+        if left <= x < right and top <= y < bottom:
+            scale = s
+            break
+    return int(round(x * scale)), int(round(y * scale)), scale
+
+class GeometryService:
+    """Monitör listesi, monitör başına DPI ve imleç konumu için önbellek.
+
+    Tablo ilk kullanımda kurulur, refresh() çağrılınca ve en fazla saniyede
+    bir yeniden okunur; böylece düzen aynı kalıp yalnızca bir monitörün
+    DPI'ı değiştiğinde de yakalanır. cursor() kare başına tek Win32 çağrısı
+    yapar. Win32 yoksa `table` ve `logical_fn` verilerek saf Python yolu
+    kullanılır (ör. Linux'ta test).
+    """
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, table: Optional[MonitorTable] = None,
+                 logical_fn=None, physical_fn=None):
+        self._lock = threading.Lock()
+        self._table = table
+        self._fixed = table is not None
+        self._next_check = 0.0
+        self._system_scale: Optional[float] = None
+        self._physical_fn = physical_fn
+        self._logical_fn = logical_fn
+        if physical_fn is None and logical_fn is None:
+            self._physical_fn = self._make_physical_fn()
+            if HAS_WIN32:
+                self._logical_fn = win32api.GetCursorPos
+
+    @staticmethod
+    def _make_physical_fn():
+        if not (user32 and hasattr(user32, "GetPhysicalCursorPos")):
+            return None
+        pt = POINT()
+        ref = ctypes.byref(pt)
+        get = user32.GetPhysicalCursorPos
+
+        def physical():
+            return (pt.x, pt.y) if get(ref) else None
+        return physical
+
+    @property
+    def available(self) -> bool:
+        return self._physical_fn is not None or self._logical_fn is not None
+
+    @staticmethod
+    def _enumerate() -> MonitorTable:
+        table: MonitorTable = []
+        if not HAS_WIN32:
+            return table
+        for hmon, _hdc, rect in win32api.EnumDisplayMonitors():
+            left, top, right, bottom = rect
+            table.append((left, top, right, bottom, get_dpi_for_monitor(int(hmon))))
+        return table
+
+    def refresh(self):
+        """Monitör tablosunu ve sistem ölçeğini yeniden oku."""
+        if self._fixed:
+            return
+        with self._lock:
+            self._system_scale = get_system_scale_factor()
+            self._table = self._enumerate()
+            self._next_check = time.perf_counter() + self.CHECK_INTERVAL
+
+    def table(self) -> MonitorTable:
+        if self._table is None:
+            self.refresh()
+        elif not self._fixed and time.perf_counter() >= self._next_check:
+            # monitör başına DPI da tabloda: yalnızca ölçek değişse bile yenilenir
+            self.refresh()
+        return self._table or []
+
+    def cursor(self) -> Tuple[int, int, str, Optional[float], Optional[Tuple[int, int]]]:
+        """Fiziksel imleç konumu: (x, y, yöntem, ölçek, mantıksal nokta | None).
+
+        DPI yolunda okunan mantıksal nokta da döner; ölçeklenmiş ikincil
+        monitörde fiziksel nokta dışarı düşerse yedek olarak ek Win32
+        çağrısı olmadan kullanılır.
+        """
+        if self._physical_fn is not None:
+            phys = self._physical_fn()
+            if phys:
+                return phys[0], phys[1], "GetPhysicalCursorPos", 1.0, None
+        if self._logical_fn is not None:
+            x_log, y_log = self._logical_fn()
+            if self._system_scale is None:
+                self._system_scale = get_system_scale_factor()
+            x, y, scale = map_logical_to_physical(x_log, y_log, self.table(),
+                                                  self._system_scale)
+            return x, y, "GetCursorPos * per-monitor DPI", scale, (x_log, y_log)
+        return 0, 0, "none", None, None
+
+    def cursor_logical(self) -> Optional[Tuple[int, int]]:
+        return self._logical_fn() if self._logical_fn is not None else None
+
+GEOMETRY = GeometryService()
+
+# --- yardımcılar --------------------------------------------------------------
+def list_monitors() -> List[Dict]:
+    with mss.mss() as sct:
+        return sct.monitors  # [0]=tüm, 1..N=tek tek
+
+def monitors_to_options(monitors: List[Dict]) -> List[str]:
+    opts = []
+    for idx, m in enumerate(monitors):
+        if idx == 0:
+            label = f"[0] Tüm Ekranlar  {m['width']}x{m['height']}"
+        else:
+            label = f"[{idx}] Monitör {idx}  {m['width']}x{m['height']} @({m['left']},{m['top']})"
+        opts.append(label)
+    return opts
+
+def parse_monitor_list(text: str) -> List[int]:
+    """'1, 2,3' -> [1, 2, 3]"""
+    return [int(t) for t in text.replace(";", ",").split(",") if t.strip()]
+
+def union_rect(mons: List[Dict]) -> Dict:
+    """Monitörleri kapsayan en küçük dikdörtgen (mss bölge sözlüğü)."""
+    left = min(m["left"] for m in mons)
+    top = min(m["top"] for m in mons)
+    right = max(m["left"] + m["width"] for m in mons)
+    bottom = max(m["top"] + m["height"] for m in mons)
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+def parse_monitor_index(text: str) -> int:
+    try:
+        return int(text.split("]")[0].strip("["))
+    except Exception:
+        return 1
+
+def set_window_topmost(root: tk.Tk, enable: bool):
+    root.wm_attributes("-topmost", 1 if enable else 0)
+    if HAS_WIN32:
+        try:
+            hwnd = win32gui.FindWindow(None, root.title())
+            if hwnd:
+                flag = win32con.HWND_TOPMOST if enable else win32con.HWND_NOTOPMOST
+                win32gui.SetWindowPos(
+                    hwnd, flag, 0, 0, 0, 0,
+                    win32con.SWP_NOMOVE | win32con.SWP_NOSIZE
+                )
+        except Exception:
+            pass
+
+def hex_to_bgr(hex_color: str) -> Tuple[int,int,int]:
+    """'#RRGGBB' -> (B, G, R)"""
+    hex_color = hex_color.strip()
+    if hex_color.startswith("#"):
+        hex_color = hex_color[1:]
+    if len(hex_color) != 6:
+        return (0, 0, 255)  # default red
+    r = int(hex_color[0:2], 16)
+    g = int(hex_color[2:4], 16)
+    b = int(hex_color[4:6], 16)
+    return (b, g, r)
+
+# --- yakalama kaynakları -----------------------------------------------------
+class CaptureSource(ABC):
+    """Yakalama arka ucu arayüzü: BGRA kare + zaman damgası üretir.
+
+    monitors() mss ile aynı biçimde liste döndürür ([0]=tümü, 1..N=tek tek).
+    grab(region, out) bölgeyi (H, W, 4) uint8 BGRA olarak verir; `out`
+    verilirse kare o tampona yazılır.
+    """
+    name = ""
+    # True ise grab() her çağrıda yeni dizi ayırır; çağıran `out` vermeli.
+    # mss her grab'de kendi tamponunu (yeni bytearray) zaten ayırır; orada
+    # üstüne kopya eklememek için o tampon üzerinde görünüm döner.
+    wants_out_buffer = False
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @abstractmethod
+    def monitors(self) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def grab(self, region: Dict, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+        ...
+
+    def cursor_in(self, L: int, T: int, W: int, H: int) -> Tuple[int, int, bool, dict]:
+        """Monitöre göre yerel imleç konumu: (cx, cy, inside, meta)."""
+        return 0, 0, False, {"method": "none", "scale": None, "phys": (0, 0)}
+
+class MssCapture(CaptureSource):
+    """Gerçek masaüstü: mss ile yakalama (oturum open() yapan thread'e aittir)."""
+    name = "mss"
+
+    def __init__(self):
+        self._sct = None
+
+    def open(self):
+        if self._sct is None:
+            self._sct = mss.mss()
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def monitors(self) -> List[Dict]:
+        if self._sct is not None:
+            return self._sct.monitors
+        return list_monitors()
+
+    def grab(self, region: Dict, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+        shot = self._sct.grab(region)
+        ts = time.perf_counter()
+        # mss ham tamponu (her çağrıda yeni bytearray, ör. Windows GDI arka
+        # ucu; bu kare boyutunda bir ayırma önlenemez) üzerinde kopyasız görünüm
+        img = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        if out is not None:
+            np.copyto(out, img)
+            return out, ts
+        return img, ts
+
+    def cursor_in(self, L: int, T: int, W: int, H: int) -> Tuple[int, int, bool, dict]:
+        if not GEOMETRY.available:
+            return super().cursor_in(L, T, W, H)
+        cx_phys, cy_phys, method, scale, logical = GEOMETRY.cursor()
+        meta = {"method": method, "scale": scale, "phys": (cx_phys, cy_phys)}
+        inside = (L <= cx_phys < L + W) and (T <= cy_phys < T + H)
+        cx = cx_phys - L
+        cy = cy_phys - T
+
+        if not inside:
+            # yedek: ham mantıksal (DPI yolunda zaten okundu)
+            raw = logical if logical is not None else GEOMETRY.cursor_logical()
+            x_raw, y_raw = raw if raw else (-1, -1)
+            if (L <= x_raw < L + W) and (T <= y_raw < T + H):
+                cx = x_raw - L
+                cy = y_raw - T
+                inside = True
+                meta["method"] += " | fallback raw"
+        return int(cx), int(cy), inside, meta
+
+class SyntheticCapture(CaptureSource):
+    """Ekransız kaynak: sentetik ya da kayıtlı karelerden sanal masaüstü.
+
+    Monitörler yan yana dizilir. `frames` verilirse (BGRA/BGR diziler)
+    kareler sırayla döner; yoksa gradyan zemin kullanılır ve `motion` ile
+    hareket seçilir: "box" (gezen kutu, kısmi değişim), "full" (her karede
+    tüm pikseller değişir), "static" (durağan ekran). İmleç sabit bir
+    Lissajous yolunda gezer, böylece ölçümler tekrarlanabilir olur.
+    """
+    name = "synthetic"
+    wants_out_buffer = True
+
+    def __init__(self, sizes: Optional[List[Tuple[int, int]]] = None,
+                 frames: Optional[List[np.ndarray]] = None, motion: str = "box"):
+        self.frames = [self._to_bgra(f) for f in frames] if frames else None
+        if self.frames:
+            h, w = self.frames[0].shape[:2]
+            sizes = [(w, h)]
+        self.sizes = list(sizes or [(1920, 1080)])
+        self.motion = motion
+        self._mons = self._layout(self.sizes)
+        self._base: Optional[np.ndarray] = None
+        self._tick = 0
+
+    @staticmethod
+    def _to_bgra(f: np.ndarray) -> np.ndarray:
+        if f.ndim == 3 and f.shape[2] == 4:
+            return np.ascontiguousarray(f, dtype=np.uint8)
+        return cv2.cvtColor(f, cv2.COLOR_BGR2BGRA)
+
+    @staticmethod
+    def load_frames(paths: List[str]) -> List[np.ndarray]:
+        frames = []
+        for p in paths:
+            img = cv2.imread(p, cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError(f"Görüntü okunamadı: {p}")
+            frames.append(img)
+        return frames
+
+    @staticmethod
+    def _layout(sizes: List[Tuple[int, int]]) -> List[Dict]:
+        mons, left = [], 0
+        for w, h in sizes:
+            mons.append({"left": left, "top": 0, "width": int(w), "height": int(h)})
+            left += int(w)
+        total = {"left": 0, "top": 0, "width": left, "height": max(h for _, h in sizes)}
+        return [total] + mons
+
+    def monitors(self) -> List[Dict]:
+        return [dict(m) for m in self._mons]
+
+    def _desktop(self) -> np.ndarray:
+        if self._base is None:
+            u = self._mons[0]
+            gx = np.linspace(0, 255, u["width"], dtype=np.float32)
+            gy = np.linspace(0, 255, u["height"], dtype=np.float32)
+            base = np.empty((u["height"], u["width"], 4), dtype=np.uint8)
+            base[:, :, 0] = gx[None, :].astype(np.uint8)
+            base[:, :, 1] = gy[:, None].astype(np.uint8)
+            base[:, :, 2] = 96
+            base[:, :, 3] = 255
+            self._base = base
+        return self._base
+
+    def grab(self, region: Dict, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+        L, T = int(region["left"]), int(region["top"])
+        W, H = int(region["width"]), int(region["height"])
+        if self.frames:
+            src = self.frames[self._tick % len(self.frames)]
+        else:
+            src = self._desktop()
+        self._tick += 1
+        if out is None:
+            out = np.empty((H, W, 4), dtype=np.uint8)
+        # bölgenin masaüstüyle kesişimi (dışı siyah kalır, mss gibi)
+        x0, y0 = max(L, 0), max(T, 0)
+        x1, y1 = min(L + W, src.shape[1]), min(T + H, src.shape[0])
+        if (x0, y0, x1, y1) != (L, T, L + W, T + H):
+            out[...] = 0
+        if x1 > x0 and y1 > y0:
+            out[y0 - T:y1 - T, x0 - L:x1 - L] = src[y0:y1, x0:x1]
+        if not self.frames:
+            # kayıtlı kare yoksa hareket zemine uygulanır
+            if self.motion == "full":
+                out[:, :, 2] = (self._tick * 7) & 0xFF
+            elif self.motion == "box":
+                u = self._mons[0]
+                bw, bh = 160, 120
+                bx = (self._tick * 12) % max(1, u["width"] - bw)
+                by = (self._tick * 5) % max(1, u["height"] - bh)
+                bx0, by0 = max(bx, L), max(by, T)
+                bx1, by1 = min(bx + bw, L + W), min(by + bh, T + H)
+                if bx1 > bx0 and by1 > by0:
+                    out[by0 - T:by1 - T, bx0 - L:bx1 - L] = (255, 255, 255, 255)
+        return out, time.perf_counter()
+
+    def cursor_in(self, L: int, T: int, W: int, H: int) -> Tuple[int, int, bool, dict]:
+        u = self._mons[0]
+        t = self._tick * 0.05
+        x = int(u["left"] + (u["width"] - 1) * (0.5 + 0.5 * np.sin(t * 0.7)))
+        y = int(u["top"] + (u["height"] - 1) * (0.5 + 0.5 * np.sin(t * 1.1)))
+        inside = (L <= x < L + W) and (T <= y < T + H)
+        return x - L, y - T, inside, {"method": "synthetic", "scale": 1.0, "phys": (x, y)}
+
+CAPTURE_BACKENDS = {
+    "mss": MssCapture,
+    "synthetic": SyntheticCapture,
+}
+
+def make_capture_source(backend: str, **kwargs) -> CaptureSource:
+    try:
+        cls = CAPTURE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen yakalama kaynağı: {backend}")
+    return cls(**kwargs)
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """'1920x1080' -> (1920, 1080)"""
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+# --- yeniden boyutlandırma ----------------------------------------------------
+RESIZE_PRESETS = ["hızlı", "dengeli", "yüksek kalite"]
+RESIZE_MODES = ["otomatik"] + RESIZE_PRESETS
+RESIZE_BUDGET_SHARE = 0.35    # küçültmeye ayrılan kare bütçesi payı
+RESIZE_PROMOTE = 0.7          # üst ön ayara geçmek için ek pay (gidip gelmeyi önler)
+RESIZE_PROBE_EVERY = 60       # bu kadar karede bir, bir üst ön ayar yeniden ölçülür
+RESIZE_PROBE_MAX = 1920       # başarısız denemelerden sonra aralık en fazla buraya uzar
+RESIZE_MIN_SAMPLE_PX = 256 * 256   # daha küçük kısmi güncellemeler ölçüme girmez
+RESIZE_PROBE_CROP = 192       # deneme ölçümünün hedefteki kırpıntı kenarı (piksel)
+RESIZE_KERNEL_PAD = {"yüksek kalite": 3}   # filtre çekirdeğinin hedef piksel cinsinden yarıçapı
+
+def resize_interpolation(mode: str, shrinking: bool) -> int:
+    """Kalite modu -> cv2 enterpolasyon bayrağı (LANCZOS yalnızca açık seçimle)."""
+    if mode == "hızlı":
+        return cv2.INTER_NEAREST
+    if mode == "yüksek kalite":
+        return cv2.INTER_LANCZOS4
+    return cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR
+
+def decimation_step(src_w: int, src_h: int, dst_w: int, dst_h: int) -> int:
+    """Hedef, kaynağın tam sayı kat küçültmesiyse k (>= 2), değilse 0."""
+    k = src_w // dst_w
+    return k if k >= 2 and src_w == dst_w * k and src_h == dst_h * k else 0
+
+def resize_bgra(src: np.ndarray, dst: np.ndarray, preset: str):
+    """BGRA kaynaktan BGRA hedefe (boyut dst'den) yeniden örnekle.
+
+    "hızlı": tam sayı katta her k'ncı piksel, piksel başına tek 4 baytlık
+    kopya (uint32 görünümü; kanal kanal adımlı kopyadan ~5x hızlı); diğer
+    oranlarda en yakın komşu. "dengeli": küçültmede INTER_AREA, büyütmede
+    doğrusal. "yüksek kalite": PIL LANCZOS; cv2'nin LANCZOS4'ü küçültmede
+    çekirdeği genişletmediği için ince desenlerde en yakın komşu kadar
+    örtüşme (aliasing) üretir, PIL'inki üretmez.
+    """
+    sh, sw = src.shape[:2]
+    dh, dw = dst.shape[:2]
+    if preset == "hızlı":
+        k = decimation_step(sw, sh, dw, dh)
+        if k:
+            o = k // 2   # blok ortasından örnekle
+            np.copyto(dst.view(np.uint32)[..., 0], src.view(np.uint32)[o::k, o::k, 0])
+            return
+    elif preset == "yüksek kalite" and dw < sw:
+        im = Image.frombuffer("RGBA", (sw, sh), np.ascontiguousarray(src), "raw", "BGRA", 0, 1)
+        cv2.cvtColor(np.asarray(im.resize((dw, dh), Image.LANCZOS)), cv2.COLOR_RGBA2BGRA, dst=dst)
+        return
+    cv2.resize(src, (dw, dh), dst=dst, interpolation=resize_interpolation(preset, dw < sw))
+
+def update_small(img: np.ndarray, rects: Optional[List[Tuple[int,int,int,int]]],
+                 small: np.ndarray, preset: str
+                 ) -> Tuple[Optional[List[Tuple[int,int,int,int]]], int]:
+    """Kalıcı küçük BGRA tamponu (ya da onun bir görünümünü) tazele.
+
+    Yalnızca kirli bölgeler yeniden örneklenir; bu, oran tam sayı olduğunda
+    (hedef pikseli kaynakta k x k bloğa denk gelir) tam kareyle birebir
+    aynı sonucu verir. Tam sayı olmayan oranda kesilmiş bölge tam karenin
+    örnekleme ızgarasıyla çakışmaz ve görünür dikişler bırakır; orada kare
+    bütünüyle küçültülür, yalnızca değişen alanlar (filtre payıyla)
+    bildirilir. Hedef koordinatlarında güncellenen dikdörtgenleri
+    (None = tamamı) ve işlenen kaynak piksel sayısını döndürür.
+    """
+    H, W = img.shape[:2]
+    th, tw = small.shape[:2]
+    same = (tw, th) == (W, H)
+    k = 1 if same else decimation_step(W, H, tw, th)
+    if rects is None or not k:
+        if same:
+            np.copyto(small, img)
+        else:
+            resize_bgra(img, small, preset)
+        if rects is None:
+            return None, W * H
+        fx, fy = tw / W, th / H
+        m = RESIZE_KERNEL_PAD.get(preset, 0) + 1 + int(np.ceil(max(fx, fy)))
+        return [(max(0, int(x0 * fx) - m), max(0, int(y0 * fy) - m),
+                 min(tw, int(np.ceil(x1 * fx)) + m), min(th, int(np.ceil(y1 * fy)) + m))
+                for x0, y0, x1, y1 in rects], W * H
+    pad = 0 if same else RESIZE_KERNEL_PAD.get(preset, 0)
+    out = []
+    px = 0
+    for x0, y0, x1, y1 in rects:
+        # kare ızgarasına hizalı: hedef pikseli dx kaynakta [dx*k, (dx+1)*k)
+        dx0, dy0 = x0 // k, y0 // k
+        dx1, dy1 = min(tw, -(-x1 // k)), min(th, -(-y1 // k))
+        if dx1 <= dx0 or dy1 <= dy0:
+            continue
+        if same:
+            small[dy0:dy1, dx0:dx1] = img[dy0:dy1, dx0:dx1]
+        elif pad:
+            # çekirdek komşu bloklara uzanır: değişiklik hedefte `pad` kadar yayılır,
+            # o alanı hesaplamak için de kaynak bir `pad` daha geniş örneklenir
+            dx0, dy0 = max(0, dx0 - pad), max(0, dy0 - pad)
+            dx1, dy1 = min(tw, dx1 + pad), min(th, dy1 + pad)
+            px0, py0 = max(0, dx0 - pad), max(0, dy0 - pad)
+            px1, py1 = min(tw, dx1 + pad), min(th, dy1 + pad)
+            tmp = np.empty((py1 - py0, px1 - px0, 4), dtype=np.uint8)
+            resize_bgra(img[py0 * k:py1 * k, px0 * k:px1 * k], tmp, preset)
+            small[dy0:dy1, dx0:dx1] = tmp[dy0 - py0:dy1 - py0, dx0 - px0:dx1 - px0]
+            px += (px1 - px0) * (py1 - py0) * k * k
+        else:
+            resize_bgra(img[dy0 * k:dy1 * k, dx0 * k:dx1 * k], small[dy0:dy1, dx0:dx1], preset)
+            px += (dx1 - dx0) * (dy1 - dy0) * k * k
+        out.append((dx0, dy0, dx1, dy1))
+    return out, px
+
+class ResizeEngine:
+    """Küçültme ön ayarını seçer ve ön ayar başına ölçülen maliyeti tutar.
+
+    "otomatik" modda kare bütçesinin RESIZE_BUDGET_SHARE kadarına sığan en
+    kaliteli ön ayar seçilir; tahmin, ön ayarın kaynak megapikseli başına
+    ölçülen süresiyle (EMA) yapılır. Ölçüm küçültme oranına bağlı olduğundan
+    geometri değişince sıfırlanır. Henüz ölçülmemiş ya da yeniden denenecek
+    bir ön ayar canlı karede değil, karenin küçük bir kırpıntısında ölçülür
+    (run_probe); böylece seçim hiçbir zaman bütçeyi körlemesine aşmaz.
+    Deneme üst ön ayarı bütçeye sokmazsa aralık iki katına çıkar. Büyütmede
+    her zaman "dengeli" kullanılır. observe() havuz thread'lerinden de
+    çağrılabilir (tek sözlük yazımı).
+    """
+    def __init__(self, mode: str = "otomatik"):
+        self.mode = mode
+        self.active = "dengeli" if mode == "otomatik" else mode
+        self.pending_probe: Optional[str] = None   # worker run_probe() ile ölçer
+        self._cost: Dict[str, float] = {}    # ön ayar -> ms / kaynak megapikseli
+        self._geometry = None
+        self._frames = 0
+        self._probe_every = RESIZE_PROBE_EVERY
+        self._probing: Optional[str] = None
+
+    def select(self, src_px: int, dst_px: int, budget_s: float) -> str:
+        """Bu kare için ön ayar (kaynak/hedef piksel sayısı, kare bütçesi)."""
+        if self.mode != "otomatik":
+            self.active = self.mode
+            return self.mode
+        if dst_px >= src_px:
+            self.active = "dengeli"
+            return self.active
+        if (src_px, dst_px) != self._geometry:
+            self._geometry = (src_px, dst_px)
+            self._cost.clear()
+            self._frames = 0
+            self._probe_every = RESIZE_PROBE_EVERY
+            self._probing = None
+            self.active = "hızlı"
+        if "dengeli" not in self._cost:
+            # yeni geometri: "dengeli" ölçülene kadar en ucuz ön ayar
+            self.pending_probe = "dengeli"
+            self.active = "hızlı"
+            return self.active
+        self._frames += 1
+        limit_ms = RESIZE_BUDGET_SHARE * budget_s * 1000.0
+        mp = src_px / 1e6
+        chosen = "hızlı"
+        for preset in ("yüksek kalite", "dengeli"):
+            cost = self._cost.get(preset)
+            if cost is None:
+                continue
+            need = limit_ms if preset == self.active else limit_ms * RESIZE_PROMOTE
+            if cost * mp <= need:
+                chosen = preset
+                break
+        if self._probing is not None and self._probing in self._cost:
+            # deneme sonucu geldi: tuttuysa aralık başa döner, tutmadıysa uzar
+            self._probe_every = (RESIZE_PROBE_EVERY if chosen == self._probing
+                                 else min(RESIZE_PROBE_MAX, self._probe_every * 2))
+            self._probing = None
+        self.active = chosen
+        if (self._probing is None and chosen != "yüksek kalite"
+                and self._frames % self._probe_every == 0):
+            self._probing = RESIZE_PRESETS[RESIZE_PRESETS.index(chosen) + 1]
+            self._cost.pop(self._probing, None)
+            self.pending_probe = self._probing
+        return chosen
+
+    def run_probe(self, img: np.ndarray, dst_w: int, dst_h: int):
+        """Bekleyen ön ayarı kaynağın ortasından küçük bir kırpıntıda ölç.
+
+        Çıktı kullanılmaz; yalnızca maliyet tahmini güncellenir.
+        """
+        preset, self.pending_probe = self.pending_probe, None
+        if preset is None:
+            return
+        H, W = img.shape[:2]
+        cw, ch = min(dst_w, RESIZE_PROBE_CROP), min(dst_h, RESIZE_PROBE_CROP)
+        sw = min(W, int(round(cw * W / dst_w)))
+        sh = min(H, int(round(ch * H / dst_h)))
+        x0, y0 = (W - sw) // 2, (H - sh) // 2
+        dst = np.empty((ch, cw, 4), dtype=np.uint8)
+        crop = img[y0:y0 + sh, x0:x0 + sw]
+        best = float("inf")
+        for _ in range(2):   # ilk geçiş önbelleği ısıtır; en kısası alınır
+            t0 = time.perf_counter()
+            resize_bgra(crop, dst, preset)
+            best = min(best, time.perf_counter() - t0)
+        self._cost.pop(preset, None)   # deneme eski tahmini değiştirir
+        self.observe(preset, sw * sh, best, min_px=0)
+
+    def observe(self, preset: str, px: int, seconds: float,
+                min_px: int = RESIZE_MIN_SAMPLE_PX):
+        """`px` kaynak pikseli `seconds` sürede küçültüldü."""
+        if px < max(1, min_px):
+            return
+        ms_per_mp = seconds * 1000.0 / (px / 1e6)
+        cost = self._cost.get(preset)
+        if cost is None:
+            self._cost[preset] = ms_per_mp      # ilk ölçüm ya da deneme sonucu
+        else:
+            self._cost[preset] = cost + 0.3 * (ms_per_mp - cost)
+
+    def summary(self) -> str:
+        text = f"küçültme={self.active}"
+        return text + " (oto)" if self.mode == "otomatik" else text
+
+def fit_size(src_w: int, src_h: int, scale: float,
+             box_w: int = 0, box_h: int = 0) -> Tuple[int, int]:
+    """Ölçek ve (varsa) tuval sınırına göre en-boy oranı korunmuş hedef boyut."""
+    f = float(scale)
+    if box_w > 0 and box_h > 0:
+        f = min(f, box_w / src_w, box_h / src_h)
+    return max(1, int(round(src_w * f))), max(1, int(round(src_h * f)))
+
+def grid_layout(sizes: List[Tuple[int, int]], scale: float,
+                box_w: int = 0, box_h: int = 0
+                ) -> Tuple[Tuple[int, int], List[Tuple[int, int, int, int]]]:
+    """N kaynağı ızgaraya yerleştir: ((çıktı_w, çıktı_h), karo başına (x, y, w, h)).
+
+    Her karo kendi hücresine ayrı ayrı sığdırılır; tek kaynakta çıktı
+    fit_size() ile aynıdır.
+    """
+    n = len(sizes)
+    cols = int(np.ceil(np.sqrt(n)))
+    rows = (n + cols - 1) // cols
+    cell_w = box_w // cols if box_w > 0 else 0
+    cell_h = box_h // rows if box_h > 0 else 0
+    fitted = [fit_size(w, h, scale, cell_w, cell_h) for w, h in sizes]
+    cw = max(w for w, _ in fitted)
+    ch = max(h for _, h in fitted)
+    tiles = []
+    for i, (tw, th) in enumerate(fitted):
+        r, c = divmod(i, cols)
+        tiles.append((c * cw + (cw - tw) // 2, r * ch + (ch - th) // 2, tw, th))
+    return (cols * cw, rows * ch), tiles
+
+# --- kare zamanlayıcı ---------------------------------------------------------
+FPS_STEPS = (15, 20, 24, 30, 45, 60)
+
+def percentile(values, q: float) -> float:
+    """Sıralı olmayan örneklerden basit en-yakın-sıra yüzdeliği."""
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q / 100.0 * len(s)))]
+
+class FrameScheduler:
+    """perf_counter tabanlı, mutlak son tarihli kare zamanlayıcı.
+
+    Son tarihler başlangıçtan itibaren k * aralık olarak ilerler; kare
+    maliyeti bir sonraki bekleme süresinden düşülür, böylece hız kaymaz.
+    Bir aralıktan fazla geride kalınırsa `policy="skip"` kaçırılan tick'leri
+    atlar, `"catchup"` ise onları beklemeden arka arkaya çalıştırır.
+    Uyarlanabilir modda kare maliyeti bütçeyi aşınca FPS bir basamak düşer,
+    yeterli pay varsa hedefe doğru geri çıkar.
+    """
+    def __init__(self, fps: int, adaptive: bool = False, policy: str = "skip"):
+        self.target_fps = max(1, int(fps))
+        self.fps = self.target_fps
+        self.adaptive = adaptive
+        self.policy = policy
+        self.skipped = 0
+        self._next: Optional[float] = None
+        self._last_tick: Optional[float] = None
+        self._cost_ema = 0.0
+        self._over = 0       # art arda bütçe aşımı
+        self._under = 0      # art arda bol pay
+        self._ticks: deque = deque(maxlen=240)
+        self._periods: deque = deque(maxlen=240)
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    def wait(self) -> float:
+        """Bir sonraki son tarihe kadar bekle; tick zamanını döndür."""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            self._account(now - self._last_tick)
+        if self._next is None:
+            self._next = now
+        delay = self._next - now
+        if delay > 0:
+            time.sleep(delay)
+        elif -delay > self.interval and self.policy == "skip":
+            missed = int(-delay / self.interval)
+            self.skipped += missed
+            self._next += missed * self.interval
+        tick = time.perf_counter()
+        if self._last_tick is not None:
+            self._periods.append(tick - self._last_tick)
+        self._ticks.append(tick)
+        self._last_tick = tick
+        self._next += self.interval
+        return tick
+
+    def _account(self, cost: float):
+        # önceki tick'in iş süresi (bekleme hariç)
+        self._cost_ema += 0.1 * (cost - self._cost_ema)
+        if not self.adaptive:
+            return
+        budget = self.interval
+        if self._cost_ema > 0.9 * budget:
+            self._over += 1
+            self._under = 0
+        elif self.fps < self.target_fps and self._cost_ema < 0.6 / self._step(+1):
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+        if self._over >= 10:
+            self._set_fps(self._step(-1))
+        elif self._under >= 60:
+            self._set_fps(self._step(+1))
+
+    def _step(self, direction: int) -> int:
+        if direction < 0:
+            lower = [f for f in FPS_STEPS if f < self.fps]
+            return lower[-1] if lower else self.fps
+        higher = [f for f in FPS_STEPS if f > self.fps]
+        return min(higher[0], self.target_fps) if higher else self.target_fps
+
+    def _set_fps(self, fps: int):
+        self._over = self._under = 0
+        if fps != self.fps:
+            self.fps = fps
+            self._next = None  # yeni aralıkla yeniden hizala
+
+    def set_target(self, fps: int, adaptive: bool):
+        """Çalışırken hedef FPS / uyarlama değişimi (sonraki tick'te geçerli)."""
+        self.target_fps = max(1, int(fps))
+        self.adaptive = adaptive
+        self._set_fps(self.target_fps)
+
+    def achieved_fps(self) -> float:
+        if len(self._ticks) < 2:
+            return 0.0
+        return (len(self._ticks) - 1) / max(1e-9, self._ticks[-1] - self._ticks[0])
+
+    def summary(self) -> str:
+        # worker her tick'te ekler: önce C düzeyinde (GIL altında atomik) kopyala
+        p = [v * 1000.0 for v in list(self._periods)]
+        text = (f"hedef {self.fps} FPS / gerçek {self.achieved_fps():.1f} FPS"
+                f" | kare p50/p95/p99 {percentile(p, 50):.1f}/{percentile(p, 95):.1f}/"
+                f"{percentile(p, 99):.1f} ms")
+        if self.adaptive and self.fps != self.target_fps:
+            text += f" (uyarlandı, istenen {self.target_fps})"
+        if self.skipped:
+            text += f" | atlanan {self.skipped}"
+        return text
+
+# --- ölçüm / profil -----------------------------------------------------------
+class PipelineProfiler:
+    """Önizleme döngüsü için aşama süreleri, sayaçlar ve isteğe bağlı iz.
+
+    Aşama süreleri kayan pencerede tutulur (p50/p95/p99). `trace=True` ise
+    her kare için bir satır (seq, ts, aşama süreleri, ayrılan bayt) saklanır
+    ve export() ile JSON/CSV'ye yazılır. `track_alloc` kare başına ayrılan
+    belleği tracemalloc ile ölçer; bu her ayırmayı yavaşlattığı (aşama
+    sürelerini de şişirdiği) için ayrı bir seçimdir ve close() ile kapatılır.
+    tracemalloc'un tepe değeri süreç genelidir: kareler eşzamanlı işlenirken
+    (ardışık düzen) `alloc_paused` ile ölçüm durdurulur.
+    enabled=False iken tüm çağrılar hemen döner.
+    """
+    def __init__(self, enabled: bool = False, trace: bool = False,
+                 track_alloc: bool = False, window: int = 300, max_trace: int = 20000):
+        self.enabled = enabled
+        self.trace = enabled and trace
+        self.track_alloc = enabled and track_alloc
+        self.alloc_paused = False
+        self.window = window
+        self.stages: Dict[str, deque] = {}
+        self.counters: Dict[str, int] = {}
+        self.allocs: deque = deque(maxlen=window)
+        self.rows: deque = deque(maxlen=max_trace)
+        self._local = threading.local()  # thread başına açık kare
+        self._owns_tracing = False
+        if self.track_alloc:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracing = True
+
+    def close(self):
+        """Bellek izlemeyi bırak; tracemalloc'u bu profilci açtıysa kapat.
+
+        Toplanan süreler ve iz satırları korunur (export() sonra da çalışır).
+        """
+        if self.track_alloc:
+            self.track_alloc = False
+            if self._owns_tracing:
+                self._tracemalloc.stop()
+                self._owns_tracing = False
+
+    def add(self, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        d = self.stages.get(stage)
+        if d is None:
+            d = self.stages[stage] = deque(maxlen=self.window)
+        d.append(seconds * 1000.0)
+        cur = getattr(self._local, "cur", None)
+        if cur is not None:
+            cur[stage] = cur.get(stage, 0.0) + seconds * 1000.0
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def frame_begin(self):
+        if not self.enabled:
+            return
+        self._local.cur = {} if self.trace else None
+        if self.track_alloc and not self.alloc_paused:
+            self._tracemalloc.reset_peak()
+            self._local.base = self._tracemalloc.get_traced_memory()[0]
+
+    def frame_end(self, seq: int, ts: float):
+        if not self.enabled:
+            return
+        self.count("frames")
+        alloc = None
+        if self.track_alloc and not self.alloc_paused:
+            alloc = max(0, self._tracemalloc.get_traced_memory()[1]
+                        - getattr(self._local, "base", 0))
+            self.allocs.append(alloc)
+        cur = getattr(self._local, "cur", None)
+        if cur is not None:
+            row = {"seq": seq, "ts": round(ts, 6)}
+            row.update({k: round(v, 3) for k, v in cur.items()})
+            if alloc is not None:
+                row["alloc_bytes"] = alloc
+            self.rows.append(row)
+            self._local.cur = None
+
+    def take_rows(self) -> List[Dict]:
+        """Biriken kare satırlarını al ve iz listesinden çıkar (alt süreç -> ana süreç)."""
+        out = []
+        rows = self.rows
+        while rows:
+            out.append(rows.popleft())
+        return out
+
+    def merge(self, rows: List[Dict]):
+        """Başka süreçteki profilcinin kare satırlarını ekle (aşama süreleri dahil)."""
+        if not self.enabled:
+            return
+        for row in rows:
+            self.count("frames")
+            for k, v in row.items():
+                if k == "alloc_bytes":
+                    self.allocs.append(v)
+                elif k not in ("seq", "ts"):
+                    d = self.stages.get(k)
+                    if d is None:
+                        d = self.stages[k] = deque(maxlen=self.window)
+                    d.append(v)
+            if self.trace:
+                self.rows.append(row)
+
+    def stats(self) -> Dict:
+        out = {"stages": {}, "counters": dict(self.counters)}
+        for k, d in list(self.stages.items()):
+            v = list(d)
+            out["stages"][k] = {"p50": percentile(v, 50), "p95": percentile(v, 95),
+                                "p99": percentile(v, 99), "n": len(v)}
+        if self.allocs:
+            a = list(self.allocs)
+            out["alloc_bytes_per_frame"] = {"p50": percentile(a, 50), "max": max(a)}
+        return out
+
+    def summary(self) -> str:
+        return " ".join(f"{k}={percentile(list(d), 50):.1f}ms"
+                        for k, d in list(self.stages.items()))
+
+    def report(self) -> str:
+        """Kaplama paneli için çok satırlı tablo."""
+        st = self.stats()
+        lines = [f"{'aşama':<9}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for k, s in st["stages"].items():
+            lines.append(f"{k:<9}{s['p50']:>7.2f}{s['p95']:>7.2f}{s['p99']:>7.2f}")
+        if "alloc_bytes_per_frame" in st:
+            a = st["alloc_bytes_per_frame"]
+            lines.append(f"bellek/kare p50={a['p50']/1024:.1f} KiB max={a['max']/1024:.1f} KiB")
+        elif self.track_alloc and self.alloc_paused:
+            lines.append("bellek/kare: ardışık düzende ölçülmez")
+        if st["counters"]:
+            lines.append(" ".join(f"{k}={v}" for k, v in st["counters"].items()))
+        return "\n".join(lines)
+
+    def export(self, path: str, extra: Optional[Dict] = None):
+        """İzi yaz: .json -> özet + kare satırları, aksi halde CSV kare satırları."""
+        import json, csv
+        rows = list(self.rows)
+        if path.lower().endswith(".json"):
+            data = {"summary": self.stats(), "frames": rows}
+            if extra:
+                data["summary"].update(extra)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            return
+        fields = ["seq", "ts"] + sorted({k for r in rows for k in r} - {"seq", "ts"})
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fields)
+            w.writeheader()
+            w.writerows(rows)
+
+# --- kare tamponları ----------------------------------------------------------
+class FrameBufferPool:
+    """Kareler arası yeniden kullanılan, aynı boyutlu uint8 tamponlar.
+
+    Boyut değişince havuz sıfırlanır; aksi halde acquire()/release()
+    kare başına bellek ayırmaz.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._free: List[np.ndarray] = []
+
+    def acquire(self, shape: Tuple[int, ...]) -> np.ndarray:
+        with self._lock:
+            if shape != self._shape:
+                self._shape = shape
+                self._free = []
+            if self._free:
+                return self._free.pop()
+        return np.empty(shape, dtype=np.uint8)
+
+    def release(self, buf: np.ndarray):
+        with self._lock:
+            if buf.shape == self._shape:
+                self._free.append(buf)
+
+class Frame:
+    """İşlenmiş RGB kare; gösterildikten sonra release() ile havuza döner."""
+    __slots__ = ("rgb", "seq", "ts", "dirty", "src_rect", "_pool")
+
+    def __init__(self, rgb: np.ndarray, seq: int, ts: float,
+                 pool: Optional[FrameBufferPool] = None,
+                 dirty: Optional[List[Tuple[int,int,int,int]]] = None,
+                 src_rect: Optional[Tuple[int,int,int,int]] = None):
+        self.rgb = rgb
+        self.seq = seq
+        self.ts = ts
+        self.dirty = dirty  # değişen alanlar (x0, y0, x1, y1); None = tamamı
+        self.src_rect = src_rect  # gösterilen alanın monitöre göre yeri; ızgarada None
+        self._pool = pool
+
+    def release(self):
+        if self._pool is not None:
+            self._pool.release(self.rgb)
+            self._pool = None
+
+    def to_image(self, into: Optional[Image.Image] = None) -> Image.Image:
+        """Kareyi PIL görüntüsü olarak ver.
+
+        PIL "RGB" tamponlarını eşlemez (frombuffer kopyalar); bu yüzden
+        aynı boyutlu `into` verilirse kare onun üzerine yerinde yazılır ve
+        kare başına yeni görüntü ayrılmaz.
+        """
+        h, w = self.rgb.shape[:2]
+        if into is not None and into.size == (w, h):
+            into.frombytes(self.rgb)
+            return into
+        return Image.frombuffer("RGB", (w, h), self.rgb, "raw", "RGB", 0, 1)
+
+class FrameMailbox:
+    """Tek yuvalı teslim kutusu (worker -> Tk thread), son kare kazanır.
+
+    Tk döngüsü geride kalırsa eski kare havuza iade edilip sayılır; kirli
+    alanları yeni kareye eklenir ki kısmi güncellemeler kaybolmasın.
+    `capture_dropped` işleme aşaması dolu olduğu için hiç işlenmeyen
+    karelerdir; yalnızca yakalama thread'i yazar (kilit gerekmez).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame: Optional[Frame] = None
+        self.posted = 0
+        self.dropped = 0
+        self.capture_dropped = 0
+        self.presented = 0
+
+    def put(self, frame: Frame):
+        with self._lock:
+            old, self._frame = self._frame, frame
+            self.posted += 1
+            if old is not None:
+                self.dropped += 1
+                if old.dirty is None or frame.dirty is None:
+                    frame.dirty = None
+                else:
+                    frame.dirty = old.dirty + frame.dirty
+        if old is not None:
+            old.release()
+
+    def take(self) -> Optional[Frame]:
+        with self._lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+    def clear(self):
+        frame = self.take()
+        if frame is not None:
+            frame.release()
+
+    def counters(self) -> str:
+        text = f"sunulan={self.presented} düşen={self.dropped}"
+        if self.capture_dropped:
+            text += f" işlenemeyen={self.capture_dropped}"
+        return text
+
+# --- bölge (ROI) ----------------------------------------------------------------
+ROI_MODES = ["kapalı", "sabit", "imleci takip"]
+ROI_MAX_ZOOM = 4.0      # büyüteçte en fazla büyütme
+ROI_SMOOTHING = 0.25    # imleci takip eden pencerenin EMA katsayısı
+
+def parse_rect(text: str) -> Tuple[int, int, int, int]:
+    """'x,y,w,h' -> (x, y, w, h)"""
+    x, y, w, h = (int(t) for t in text.replace(" ", "").split(","))
+    return x, y, w, h
+
+# --- değişim tespiti ----------------------------------------------------------
+IDLE_GRAB_EVERY = 4     # durağan ekranda kaç tick'te bir yakalanacağı
+FULL_REFRESH_S = 2.0    # örneklemede kaçan küçük değişiklikler için tam tazeleme aralığı
+
+class ChangeDetector:
+    """Seyreltilmiş (her `step` piksel) örnek üzerinde karo bazlı kare farkı.
+
+    diff() kaynak koordinatlarında kirli dikdörtgenler döndürür:
+    None = tamamı (ilk kare, boyut değişti ya da çoğu karo kirli), [] = değişiklik yok.
+    """
+    def __init__(self, grid: Tuple[int, int] = (16, 9), step: int = 4,
+                 max_dirty: float = 0.6):
+        self.grid = grid
+        self.step = step
+        self.max_dirty = max_dirty
+        self._prev: Optional[np.ndarray] = None
+        self._ref: Optional[np.ndarray] = None
+
+    def reset(self):
+        self._prev = None
+        self._ref = None
+
+    def changed_since_check(self, img: np.ndarray) -> bool:
+        """Tam çözünürlükte: önceki çağrıdan beri kare değişti mi?
+
+        Seyreltilmiş örneklemenin kaçırdığı değişiklikler için periyodik
+        tazelemede kullanılır; durağan ekranda tam kare yeniden gönderilmez.
+        """
+        if self._ref is None or self._ref.shape != img.shape:
+            self._ref = img.copy()
+            return True
+        if np.array_equal(img, self._ref):
+            return False
+        np.copyto(self._ref, img)
+        return True
+
+    def diff(self, img: np.ndarray) -> Optional[List[Tuple[int,int,int,int]]]:
+        # BGRA pikseli tek uint32 olarak karşılaştır (kanal ekseni yok)
+        s = img.view(np.uint32)[::self.step, ::self.step, 0]
+        if self._prev is None or self._prev.shape != s.shape:
+            self._prev = np.ascontiguousarray(s)
+            self._cur = np.empty_like(self._prev)
+            self._neq = np.empty(s.shape, dtype=bool)
+            sh, sw = s.shape[:2]
+            self._xs = np.unique(np.linspace(0, sw, self.grid[0] + 1).astype(int))
+            self._ys = np.unique(np.linspace(0, sh, self.grid[1] + 1).astype(int))
+            return None
+        # adımlı görünüm önce kalıcı tampona alınır: ufunc adımlı girdide her
+        # çağrıda ara tampon ayırır; değişince tamponlar yer değiştirir
+        np.copyto(self._cur, s)
+        changed = np.not_equal(self._cur, self._prev, out=self._neq)
+        if not changed.any():
+            return []
+        self._prev, self._cur = self._cur, self._prev
+        xs, ys = self._xs, self._ys
+        tiles = np.logical_or.reduceat(changed, ys[:-1], axis=0)
+        tiles = np.logical_or.reduceat(tiles, xs[:-1], axis=1)
+        if tiles.mean() > self.max_dirty:
+            return None
+        H, W = img.shape[:2]
+        st = self.step
+        rects = []
+        # her karo satırında bitişik kirli karoları tek dikdörtgende birleştir
+        for ty in range(tiles.shape[0]):
+            row = tiles[ty]
+            tx = 0
+            while tx < len(row):
+                if not row[tx]:
+                    tx += 1
+                    continue
+                start = tx
+                while tx < len(row) and row[tx]:
+                    tx += 1
+                rects.append((int(xs[start]) * st, int(ys[ty]) * st,
+                              min(W, int(xs[tx]) * st), min(H, int(ys[ty + 1]) * st)))
+        return rects
+
+# --- ok yönleri ----------------------------------------------------------------
+_D = 0.5 ** 0.5
+ARROW_VECTORS: Dict[str, Tuple[float, float]] = {
+    "sağ": (1.0, 0.0), "sol": (-1.0, 0.0),
+    "yukarı": (0.0, -1.0), "aşağı": (0.0, 1.0),
+    "çapraz sağ-aşağı": (_D, _D), "çapraz sol-aşağı": (-_D, _D),
+    "çapraz sağ-yukarı": (_D, -_D), "çapraz sol-yukarı": (-_D, -_D),
+}
+ANCHOR_MODES = ["uçtan dışarı çiz", "dışarıdan uca çiz"]
+
+# --- imleç katmanları (önceden çizilmiş sprite'lar) ---------------------------
+Box = Tuple[int, int, int, int]
+
+class Sprite:
+    """Önceden çizilmiş RGBA katman; (ax, ay) imlecin sprite içindeki yeri.
+
+    Renk alfa ile önceden çarpılmış tutulur; blend() karede yalnızca
+    sprite'ın kapladığı küçük alanda tamsayı karışım yapar.
+    """
+    __slots__ = ("alpha", "premul", "ax", "ay")
+
+    def __init__(self, mask: np.ndarray, color_rgb: Tuple[int,int,int],
+                 ax: int, ay: int, opacity: float = 1.0):
+        a = mask.astype(np.uint16)
+        if opacity < 1.0:
+            a = (a * opacity).astype(np.uint16)
+        self.alpha = a[:, :, None]
+        self.premul = self.alpha * np.array(color_rgb, dtype=np.uint16)
+        self.ax, self.ay = ax, ay
+
+    def blend(self, rgb: np.ndarray, x: int, y: int, clip: Box) -> Optional[Box]:
+        """(x, y) noktasına, clip = (x0, y0, w, h) içinde kalarak karıştır."""
+        h, w = self.alpha.shape[:2]
+        cx0, cy0, cw, ch = clip
+        x0, y0 = x - self.ax, y - self.ay
+        bx0, by0 = max(x0, cx0), max(y0, cy0)
+        bx1, by1 = min(x0 + w, cx0 + cw, rgb.shape[1]), min(y0 + h, cy0 + ch, rgb.shape[0])
+        if bx1 <= bx0 or by1 <= by0:
+            return None
+        a = self.alpha[by0 - y0:by1 - y0, bx0 - x0:bx1 - x0]
+        dst = rgb[by0:by1, bx0:bx1]
+        mix = dst * (255 - a)
+        mix += self.premul[by0 - y0:by1 - y0, bx0 - x0:bx1 - x0]
+        mix //= 255
+        dst[...] = mix
+        return bx0, by0, bx1, by1
+
+def render_arrow_sprite(ux: float, uy: float, length: float, thickness: int,
+                        color_rgb: Tuple[int,int,int], tip_out: bool) -> Sprite:
+    """Ok sprite'ı; tip_out ise ok imleçten dışarı, değilse ucu imlecte."""
+    length = max(1.0, length)
+    ex, ey = int(round(ux * length)), int(round(uy * length))
+    p1, p2 = ((0, 0), (ex, ey)) if tip_out else ((-ex, -ey), (0, 0))
+    pad = thickness + int(0.35 * max(abs(ex), abs(ey))) + 2
+    ox, oy = pad - min(p1[0], p2[0]), pad - min(p1[1], p2[1])
+    mask = np.zeros((abs(ey) + 2 * pad + 1, abs(ex) + 2 * pad + 1), dtype=np.uint8)
+    cv2.arrowedLine(mask, (p1[0] + ox, p1[1] + oy), (p2[0] + ox, p2[1] + oy), 255,
+                    thickness=thickness, line_type=cv2.LINE_AA, tipLength=0.35)
+    return Sprite(mask, color_rgb, ox, oy)
+
+def render_disc_sprite(radius: int, color_rgb: Tuple[int,int,int], opacity: float = 1.0,
+                       thickness: int = -1) -> Sprite:
+    """Dolu daire (iz noktası) ya da halka (thickness > 0, tıklama vurgusu)."""
+    c = radius + max(1, thickness) + 1
+    mask = np.zeros((2 * c + 1, 2 * c + 1), dtype=np.uint8)
+    cv2.circle(mask, (c, c), radius, 255, thickness=thickness, lineType=cv2.LINE_AA)
+    return Sprite(mask, color_rgb, c, c, opacity)
+
+class CursorOverlay:
+    """İmleç oku + isteğe bağlı tıklama vurgusu ve iz katmanları.
+
+    Sprite'lar (stil, ölçek, solma seviyesi) anahtarıyla bir kez çizilip
+    önbellekte tutulur; kare başına çizim yoktur, yalnızca karıştırma.
+    plan() durumu günceller ve karıştırılacak (sprite, x, y, clip)
+    listesini döndürür (tek thread'den çağrılmalı); compose() durumsuzdur,
+    işleme thread'lerinde de çağrılabilir.
+    """
+    TRAIL_S = 0.5         # iz noktalarının ömrü
+    TRAIL_POINTS = 24
+    CLICK_S = 0.4         # tıklama vurgusunun süresi
+    FADE_LEVELS = 8
+    CACHE_MAX = 64
+
+    def __init__(self, clicks: bool = False, trail: bool = False, click_fn=None):
+        self.clicks = clicks
+        self.trail = trail
+        self._click_fn = click_fn or mouse_button_down
+        self._cache: Dict[tuple, Sprite] = {}
+        self._trail: deque = deque(maxlen=self.TRAIL_POINTS)   # (t, x, y)
+        self._click: Optional[Tuple[float, int, int]] = None
+        self._was_down = False
+        self._clip: Optional[Box] = None
+
+    def _sprite(self, key: tuple, render) -> Sprite:
+        s = self._cache.get(key)
+        if s is None:
+            if len(self._cache) >= self.CACHE_MAX:
+                self._cache.pop(next(iter(self._cache)))
+            s = self._cache[key] = render()
+        return s
+
+    def arrow(self, style: tuple, f: float) -> Sprite:
+        """style = (arrow_len, arrow_offset, arrow_dir, color_bgr, anchor_mode)"""
+        arrow_len, arrow_offset, arrow_dir, color_bgr, anchor_mode = style
+        f = round(f, 4)
+
+        def render():
+            ux, uy = ARROW_VECTORS.get(arrow_dir, (0.0, 0.0))
+            total = (max(5, int(arrow_len)) + int(arrow_offset)) * f
+            return render_arrow_sprite(ux, uy, total, max(1, int(round(2 * f))),
+                                       tuple(color_bgr[::-1]), anchor_mode == ANCHOR_MODES[0])
+        return self._sprite(("arrow",) + tuple(style) + (f,), render)
+
+    def _faded(self, kind: str, age: float, life: float, radius: int,
+               color_rgb: Tuple[int,int,int], thickness: int) -> Sprite:
+        level = min(self.FADE_LEVELS - 1, int(age / life * self.FADE_LEVELS))
+        opacity = 1.0 - level / self.FADE_LEVELS
+        return self._sprite((kind, radius, color_rgb, thickness, level),
+                            lambda: render_disc_sprite(radius, color_rgb, opacity, thickness))
+
+    @property
+    def animating(self) -> bool:
+        """Solan katman var mı (imleç dursa da kare üretilmeli)."""
+        return bool(self._trail) or self._click is not None
+
+    def reset(self):
+        self._trail.clear()
+        self._click = None
+
+    def plan(self, pos: Optional[Tuple[int, int]], clip: Box, f: float,
+             style: tuple, now: float) -> list:
+        """Bu karede karıştırılacak katmanlar; pos imlecin kare koordinatı (ya da None)."""
+        if clip != self._clip:
+            self.reset()
+            self._clip = clip
+        color_rgb = tuple(int(c) for c in style[3][::-1])
+        draws = []
+        if self.trail:
+            while self._trail and now - self._trail[0][0] > self.TRAIL_S:
+                self._trail.popleft()
+            if pos is not None and (not self._trail or self._trail[-1][1:] != pos):
+                self._trail.append((now, pos[0], pos[1]))
+            r = max(2, int(round(4 * f)))
+            for t, x, y in self._trail:
+                if (x, y) != pos:
+                    draws.append((self._faded("dot", now - t, self.TRAIL_S, r, color_rgb, -1),
+                                  x, y, clip))
+        if self.clicks:
+            down = self._click_fn()
+            if down and not self._was_down and pos is not None:
+                self._click = (now, pos[0], pos[1])
+            self._was_down = down
+            if self._click is not None:
+                t, x, y = self._click
+                if now - t > self.CLICK_S:
+                    self._click = None
+                else:
+                    r = max(6, int(round(18 * f)))
+                    draws.append((self._faded("ring", now - t, self.CLICK_S, r, color_rgb,
+                                              max(1, int(round(3 * f)))), x, y, clip))
+        if pos is not None:
+            draws.append((self.arrow(style, f), pos[0], pos[1], clip))
+        return draws
+
+    @staticmethod
+    def compose(rgb: np.ndarray, draws: list) -> Optional[Box]:
+        """Katmanları karıştır; hepsinin kapladığı alanı döndür."""
+        box = None
+        for sprite, x, y, clip in draws:
+            b = sprite.blend(rgb, x, y, clip)
+            if b is None:
+                continue
+            box = b if box is None else (min(box[0], b[0]), min(box[1], b[1]),
+                                         max(box[2], b[2]), max(box[3], b[3]))
+        return box
+
+# --- kayıt (arka plan kodlayıcı) ---------------------------------------------
+RECORD_FORMATS = ["video", "resim"]
+DROP_POLICIES = ["eskiyi at", "yeniyi at"]
+
+class FrameRecorder(threading.Thread):
+    """Önizleme karelerini sınırlı kuyruk üzerinden diske yazan kodlayıcı thread.
+
+    offer() yakalama döngüsünden çağrılır ve asla beklemez: kare kendi
+    havuz tamponuna kopyalanıp kuyruğa girer; kuyruk doluysa düşürme
+    politikasına göre en eski ya da gelen kare atılır. "video" biçiminde
+    cv2.VideoWriter kullanılır; önizleme durağanken üretilmeyen kareler
+    zaman damgasına göre önceki kare tekrarlanarak doldurulur. "resim"
+    biçiminde kareler `path` klasörü altında segment klasörlerine yazılır.
+    Boyut değişince ya da her `segment_frames` karede yeni segment açılır.
+    """
+    MAX_REPEAT_S = 10.0   # uzun duraklamada en fazla bu kadar kare tekrarı
+
+    def __init__(self, path: str, fps: int, fmt: str = "video", codec: str = "mp4v",
+                 image_ext: str = ".jpg", queue_size: int = 32,
+                 drop_policy: str = "eskiyi at", segment_frames: Optional[int] = None):
+        super().__init__(name="preview-recorder", daemon=True)
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(f"Bilinmeyen kayıt biçimi: {fmt}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Bilinmeyen düşürme politikası: {drop_policy}")
+        self.path = path
+        self.fps = max(1, int(fps))
+        self.fmt = fmt
+        self.codec = codec
+        self.image_ext = image_ext
+        self.drop_policy = drop_policy
+        self.segment_frames = segment_frames or self.fps * 60
+        self.queue: "queue.Queue[Tuple[np.ndarray, float]]" = queue.Queue(maxsize=max(1, queue_size))
+        self.pool = FrameBufferPool()
+        self.offered = 0
+        self.encoded = 0
+        self.repeated = 0
+        self.dropped = 0
+        self.segments = 0
+        self.error: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._writer = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._seg_count = 0
+        self._t0: Optional[float] = None
+        self._slot = 0
+        self._bgr: Optional[np.ndarray] = None
+        self._closed_at: Optional[float] = None
+
+    # ---- yakalama thread'i ----
+    def offer(self, rgb: np.ndarray, ts: float) -> bool:
+        """Kareyi kuyruğa kopyala (engellemez); kuyruğa girdiyse True."""
+        self.offered += 1
+        if self.error is not None or self._stop_event.is_set():
+            return False
+        if self.queue.full():
+            if self.drop_policy == "yeniyi at":
+                self.dropped += 1
+                return False
+            try:
+                old, _ = self.queue.get_nowait()
+                self.pool.release(old)
+                self.dropped += 1
+            except queue.Empty:
+                pass
+        buf = self.pool.acquire(rgb.shape)
+        np.copyto(buf, rgb)
+        try:
+            self.queue.put_nowait((buf, ts))
+        except queue.Full:
+            self.pool.release(buf)
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Kuyruktakileri yazıp dosyaları kapat."""
+        self._closed_at = time.perf_counter()
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def counters(self) -> str:
+        text = (f"kayıt: yazılan={self.encoded} düşen={self.dropped} "
+                f"kuyruk={self.queue.qsize()}")
+        if self.error:
+            text += f" HATA: {self.error}"
+        return text
+
+    # ---- kodlayıcı thread'i ----
+    def run(self):
+        try:
+            while True:
+                try:
+                    buf, ts = self.queue.get(timeout=0.1)
+                except queue.Empty:
+                    if self._stop_event.is_set():
+                        break
+                    continue
+                try:
+                    self._write(buf, ts)
+                finally:
+                    self.pool.release(buf)
+            if self._closed_at is not None:
+                self._fill_until(self._closed_at)  # son durağan bölüm de videoda kalsın
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self._close_segment()
+
+    def _segment_path(self) -> str:
+        n = self.segments
+        if self.fmt == "resim":
+            return os.path.join(self.path, f"{n:04d}")
+        if n == 0:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_{n:03d}{ext}"
+
+    def _open_segment(self, w: int, h: int):
+        path = self._segment_path()
+        if self.fmt == "video":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec),
+                                     float(self.fps), (w, h))
+            if not writer.isOpened():
+                raise RuntimeError(f"Video yazıcı açılamadı: {path} ({self.codec})")
+            self._writer = writer
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._writer = path
+        self._size = (w, h)
+        self._seg_count = 0
+        self._t0 = None
+        self._bgr = np.empty((h, w, 3), dtype=np.uint8)
+        self.segments += 1
+
+    def _close_segment(self):
+        if self.fmt == "video" and self._writer is not None:
+            self._writer.release()
+        self._writer = None
+
+    def _emit(self, bgr: np.ndarray):
+        if self.fmt == "video":
+            self._writer.write(bgr)
+        else:
+            name = os.path.join(self._writer, f"{self._slot:06d}{self.image_ext}")
+            if not cv2.imwrite(name, bgr):
+                raise RuntimeError(f"Resim yazılamadı: {name}")
+        self._seg_count += 1
+
+    def _fill_until(self, ts: float):
+        # önizleme durağanken kare gelmez: videoda önceki kareyi tekrarla
+        if self.fmt != "video" or self._writer is None or self._t0 is None:
+            return
+        slot = int((ts - self._t0) * self.fps + 0.5)
+        gap = min(slot - self._slot - 1, int(self.MAX_REPEAT_S * self.fps))
+        for _ in range(max(0, gap)):
+            self._emit(self._bgr)
+            self.repeated += 1
+        self._slot += max(0, gap)
+
+    def _write(self, rgb: np.ndarray, ts: float):
+        h, w = rgb.shape[:2]
+        if self._writer is None or self._size != (w, h) or self._seg_count >= self.segment_frames:
+            self._close_segment()
+            self._open_segment(w, h)
+        if self._t0 is None:
+            self._t0 = ts
+            self._slot = 0
+        else:
+            self._fill_until(ts)
+            self._slot = max(int((ts - self._t0) * self.fps + 0.5), self._slot + 1)
+        cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._bgr)
+        self._emit(self._bgr)
+        self.encoded += 1
+
+# --- ağ yayını (MJPEG / WebSocket) -------------------------------------------
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B6B"
+STREAM_PAGE = """<!doctype html><meta charset="utf-8"><title>{title}</title>
+<body style="margin:0;background:#000"><img src="/stream.mjpg" style="max-width:100%">
+"""
+
+def parse_host_port(text: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    """'8765' | 'host:8765' -> (host, port)
+
+    Yayında erişim denetimi yok: host verilmezse yalnızca bu makineye açılır;
+    ağa açmak için adres açıkça verilmeli (ör. 0.0.0.0:8765).
+    """
+    host, _, port = text.strip().rpartition(":")
+    return host or default_host, int(port)
+
+class PreviewStreamServer:
+    """Önizleme karelerini MJPEG ve WebSocket ile yayınlayan HTTP sunucu.
+
+    Her kare bir kez kodlanır; istemciler kendi hızlarında son kareyi alır.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, quality: int = 80,
+                 client_fps: int = 15, max_fps: int = 60):
+        self.host = host
+        self.port = port
+        self.quality = int(quality)
+        self.client_fps = client_fps
+        self.max_fps = max_fps
+        self.offered = 0
+        self.encoded = 0
+        self.clients: Dict[int, Dict] = {}     # id -> {"kind", "addr", "fps", "sent", "skipped"}
+        self._next_client = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: Optional[np.ndarray] = None     # offer() -> kodlayıcı (BGR)
+        self._work: Optional[np.ndarray] = None
+        self._held: Optional[np.ndarray] = None        # istemci yokken son kare (RGB kopyası)
+        self._held_new = False
+        self._fresh = False
+        self._offer_seq = 0      # saklanan son karenin sırası
+        self._jpeg_offer = 0     # _jpeg hangi kareden kodlandı
+        self._seq = 0
+        self._jpeg: Optional[bytes] = None
+        self._closing = False
+        self._httpd = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host = self.host if self.host not in ("", "0.0.0.0") else "localhost"
+        return f"http://{host}:{self.port}/"
+
+    def start(self):
+        from http.server import ThreadingHTTPServer
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _stream_handler_class())
+        self._httpd.daemon_threads = True
+        self._httpd.stream = self
+        self.port = self._httpd.server_address[1]   # port=0 ise atanan port
+        for target, name in ((self._httpd.serve_forever, "stream-http"),
+                             (self._encode_loop, "stream-encode")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+        for t in self._threads:
+            t.join(timeout=2.0)
+
+    def counters(self) -> str:
+        return f"yayın: istemci={len(self.clients)} kodlanan={self.encoded}"
+
+    # ---- worker thread'i ----
+    def offer(self, rgb: np.ndarray, ts: float):
+        """Son kareyi kodlayıcıya bırak (engellemez; eski bekleyen kare ezilir)."""
+        self.offered += 1
+        with self._cond:
+            self._offer_seq += 1
+            if not self.clients:
+                # istemci yok: dönüşüm/kodlama yok, yalnızca sunucunun kendi tamponuna
+                # düz kopya (havuz tamponu Tk'dan dönünce yeniden yazılabilir)
+                if self._held is None or self._held.shape != rgb.shape:
+                    self._held = np.empty(rgb.shape, dtype=np.uint8)
+                np.copyto(self._held, rgb)
+                self._held_new = True
+                return
+            self._held_new = False
+            if self._pending is None or self._pending.shape != rgb.shape:
+                self._pending = np.empty(rgb.shape, dtype=np.uint8)
+            cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._pending)
+            self._fresh = True
+            self._cond.notify_all()
+
+    # ---- kodlayıcı thread'i ----
+    def _encode_loop(self):
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.quality]
+        while True:
+            with self._cond:
+                while not ((self._fresh or self._held_new) and self.clients) \
+                        and not self._closing:
+                    self._cond.wait()
+                if self._closing:
+                    return
+                if self._fresh:
+                    # tamponları takas et: offer() kodlama sürerken yenisini yazabilir
+                    self._pending, self._work = self._work, self._pending
+                    self._fresh = False
+                else:
+                    # istemci yokken saklanan kare: dönüşüm ilk istemci gelince, kilit
+                    # altında (offer() _held'e yazarken okunmaz)
+                    held = self._held
+                    if self._work is None or self._work.shape != held.shape:
+                        self._work = np.empty(held.shape, dtype=np.uint8)
+                    cv2.cvtColor(held, cv2.COLOR_RGB2BGR, dst=self._work)
+                self._held_new = False
+                offer_seq = self._offer_seq
+            ok, enc = cv2.imencode(".jpg", self._work, params)
+            if not ok:
+                continue
+            with self._cond:
+                self._jpeg = enc.tobytes()
+                self._jpeg_offer = offer_seq
+                self._seq += 1
+                self.encoded += 1
+                self._cond.notify_all()
+
+    # ---- istemci thread'leri ----
+    def _wait_frame(self, last_seq: int, timeout: float = 1.0) -> Optional[Tuple[int, bytes]]:
+        """last_seq'ten yeni kare gelene kadar bekle; kapanışta ya da süre dolunca None."""
+        with self._cond:
+            if self._seq <= last_seq and not self._closing:
+                self._cond.wait_for(lambda: self._seq > last_seq or self._closing, timeout)
+            if self._closing or self._seq <= last_seq:
+                return None
+            return self._seq, self._jpeg
+
+    def _add_client(self, kind: str, addr, fps: int) -> int:
+        with self._lock:
+            self._next_client += 1
+            cid = self._next_client
+            self.clients[cid] = {"kind": kind, "addr": f"{addr[0]}:{addr[1]}",
+                                 "fps": fps, "sent": 0, "skipped": 0}
+        with self._cond:
+            self._cond.notify_all()   # bekleyen kare varsa kodlayıcı uyansın
+        return cid
+
+    def _remove_client(self, cid: int):
+        with self._lock:
+            self.clients.pop(cid, None)
+
+    def serve_client(self, kind: str, addr, fps: int, send):
+        """İstemci döngüsü: hız sınırı + son kare; send(jpeg) hata verirse biter."""
+        fps = max(1, min(self.max_fps, fps or self.client_fps))
+        cid = self._add_client(kind, addr, fps)
+        stats = self.clients[cid]
+        interval = 1.0 / fps
+        last_seq = 0
+        next_t = time.perf_counter()
+        try:
+            while not self._closing:
+                delay = next_t - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                got = self._wait_frame(last_seq)
+                if got is None:
+                    continue
+                seq, jpeg = got
+                if last_seq:
+                    stats["skipped"] += seq - last_seq - 1
+                last_seq = seq
+                send(jpeg)
+                stats["sent"] += 1
+                next_t = max(next_t + interval, time.perf_counter())
+        except (OSError, ValueError):
+            pass   # istemci bağlantıyı kapattı
+        finally:
+            self._remove_client(cid)
+
+    def snapshot(self, addr, timeout: float = 2.0) -> Optional[bytes]:
+        """Saklanan son karenin JPEG'i (gerekirse kodlanmasını bekler)."""
+        cid = self._add_client("jpg", addr, 0)
+        try:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closing or (
+                    self._jpeg is not None and self._jpeg_offer == self._offer_seq), timeout)
+                return self._jpeg
+        finally:
+            self._remove_client(cid)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            clients = [dict(c, id=cid) for cid, c in self.clients.items()]
+        return {"offered": self.offered, "encoded": self.encoded, "seq": self._seq,
+                "clients": clients}
+
+_stream_handler = None
+
+def _stream_handler_class():
+    """HTTP istek işleyicisi; http.server yalnızca yayın açılınca içe aktarılır."""
+    global _stream_handler
+    if _stream_handler is not None:
+        return _stream_handler
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+
+    class _StreamHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        timeout = 10   # yazma bu kadar takılırsa istemci düşer
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def do_GET(self):
+            stream: PreviewStreamServer = self.server.stream
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            try:
+                fps = int(query.get("fps", ["0"])[0])
+            except ValueError:
+                fps = 0
+            if url.path == "/":
+                self._reply(200, "text/html; charset=utf-8",
+                            STREAM_PAGE.format(title=APP_TITLE).encode("utf-8"))
+            elif url.path == "/frame.jpg":
+                jpeg = stream.snapshot(self.client_address)
+                if jpeg is None:
+                    self._reply(503, "text/plain", b"no frame yet")
+                else:
+                    self._reply(200, "image/jpeg", jpeg)
+            elif url.path == "/stats":
+                self._reply(200, "application/json", json.dumps(stream.stats()).encode("utf-8"))
+            elif url.path == "/stream.mjpg":
+                self._serve_mjpeg(stream, fps)
+            elif url.path == "/ws" and self.headers.get("Upgrade", "").lower() == "websocket":
+                self._serve_ws(stream, fps)
+            else:
+                self._reply(404, "text/plain", b"not found")
+
+        def _reply(self, code: int, ctype: str, body: bytes):
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _serve_mjpeg(self, stream: PreviewStreamServer, fps: int):
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            def send(jpeg: bytes):
+                self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                                 + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+                self.wfile.flush()
+            stream.serve_client("mjpeg", self.client_address, fps, send)
+
+        def _serve_ws(self, stream: PreviewStreamServer, fps: int):
+            key = self.headers.get("Sec-WebSocket-Key", "")
+            accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            self.close_connection = True
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept)
+            self.end_headers()
+            self.wfile.flush()
+
+            def send(jpeg: bytes):
+                # sunucu çerçeveleri maskesiz; 0x82 = FIN + ikili mesaj
+                n = len(jpeg)
+                if n < 126:
+                    head = struct.pack("!BB", 0x82, n)
+                elif n < 1 << 16:
+                    head = struct.pack("!BBH", 0x82, 126, n)
+                else:
+                    head = struct.pack("!BBQ", 0x82, 127, n)
+                self.wfile.write(head + jpeg)
+                self.wfile.flush()
+            stream.serve_client("ws", self.client_address, fps, send)
+
+    _stream_handler = _StreamHandler
+    return _stream_handler
+
+# --- önizleme ayarları --------------------------------------------------------
+class PreviewConfig:
+    """Worker ayarlarının değiştirilemez anlık görüntüsü.
+
+    Tk thread'i yeni bir nesne kurup worker.configure() ile tek atamada
+    verir; worker onu bir sonraki tick'in başında bütünüyle uygular, böylece
+    bir kare asla yarı eski yarı yeni ayarla işlenmez. Alan adları
+    PreviewWorker parametreleriyle aynıdır.
+    """
+    DEFAULTS = {
+        "monitor_idx": 1, "scale": 0.5, "fps": 30,
+        "show_cursor": True, "debug": False,
+        "arrow_len": 24, "arrow_dir": "sağ", "arrow_color_bgr": (0, 0, 255),
+        "anchor_mode": "dışarıdan uca çiz", "arrow_offset": 0,
+        "resize_mode": "otomatik", "pipeline_workers": 0,
+        "monitor_indices": None, "adaptive_fps": False,
+        "roi_mode": "kapalı", "roi": None, "roi_size": (640, 360),
+        "click_highlight": False, "cursor_trail": False,
+    }
+    __slots__ = tuple(DEFAULTS)
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"Bilinmeyen ayar: {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            object.__setattr__(self, name, values.get(name, default))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PreviewConfig değiştirilemez; replace() kullanın")
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def replace(self, **changes) -> "PreviewConfig":
+        values = self.as_dict()
+        values.update(changes)
+        return PreviewConfig(**values)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PreviewConfig) and self.as_dict() == other.as_dict()
+
+    def monitors(self) -> List[int]:
+        return list(self.monitor_indices) if self.monitor_indices else [self.monitor_idx]
+
+    def pipelined(self) -> bool:
+        # ROI bölgesi tick başına değişebildiği için tek thread döngüsünde işlenir
+        return (self.pipeline_workers > 0 and len(self.monitors()) == 1
+                and self.roi_mode == "kapalı")
+
+# --- worker thread ------------------------------------------------------------
+INVALID_MONITOR_ERROR = "Geçersiz monitör index"
+
+class PreviewWorker(threading.Thread):
+    def __init__(self, ui, monitor_idx: int, scale: float, fps: int,
+                 show_cursor: bool, debug: bool,
+                 arrow_len: int, arrow_dir: str, arrow_color_bgr: Tuple[int,int,int],
+                 anchor_mode: str, arrow_offset: int,
+                 source: Optional[CaptureSource] = None,
+                 resize_mode: str = "otomatik", pipeline_workers: int = 0,
+                 monitor_indices: Optional[List[int]] = None,
+                 adaptive_fps: bool = False,
+                 profiler: Optional[PipelineProfiler] = None,
+                 roi_mode: str = "kapalı", roi: Optional[Tuple[int,int,int,int]] = None,
+                 roi_size: Tuple[int, int] = (640, 360),
+                 click_highlight: bool = False, cursor_trail: bool = False):
+        super().__init__(daemon=True)
+        self.ui = ui
+        self.source = source if source is not None else MssCapture()
+        self._roi_center: Optional[Tuple[float, float]] = None
+        self.scheduler = FrameScheduler(fps, adaptive=adaptive_fps)
+        self.overlay = CursorOverlay()
+        self.resizer = ResizeEngine(resize_mode)
+        # Tk thread'i yalnızca self.config'i değiştirir (configure); aşağıdaki
+        # alanlar worker thread'inde, tick başında bu anlık görüntüden doldurulur
+        self.config = PreviewConfig(
+            monitor_idx=monitor_idx, scale=scale, fps=fps,
+            show_cursor=show_cursor, debug=debug,
+            arrow_len=arrow_len, arrow_dir=arrow_dir, arrow_color_bgr=arrow_color_bgr,
+            anchor_mode=anchor_mode, arrow_offset=arrow_offset,
+            resize_mode=resize_mode, pipeline_workers=pipeline_workers,
+            monitor_indices=monitor_indices, adaptive_fps=adaptive_fps,
+            roi_mode=roi_mode, roi=roi, roi_size=roi_size,
+            click_highlight=click_highlight, cursor_trail=cursor_trail)
+        self._applied: Optional[PreviewConfig] = None
+        self._apply(self.config)
+        # debug satırı aşama sürelerini de gösterdiği için debug'da da açık
+        self.profiler = profiler or PipelineProfiler()
+        self._profile_enabled = self.profiler.enabled   # başlangıç durumu (--profile)
+        self.profiler.enabled = self._profile_enabled or debug
+        self.pool = FrameBufferPool()
+        self._small_pool = FrameBufferPool()
+        self.mailbox = FrameMailbox()
+        self.recorder: Optional[FrameRecorder] = None  # Tk thread'i atar/kaldırır
+        self.streamer: Optional[PreviewStreamServer] = None
+        self.status_text = ""               # debug satırı; Tk thread'i okur
+        self.error: Optional[str] = None    # durma nedeni; Tk thread'i okur
+        self._grab_buf: Optional[np.ndarray] = None
+        self._small_buf: Optional[np.ndarray] = None
+        # not: Thread._stop ile çakışmasın (join() onu çağırır)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _publish(self, frame: Frame):
+        # kayıt/yayın açıksa kare teslimden önce kopyalanır (Tk thread'i sonra havuza iade eder)
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.offer(frame.rgb, frame.ts)
+        streamer = self.streamer
+        if streamer is not None:
+            streamer.offer(frame.rgb, frame.ts)
+        self.mailbox.put(frame)
+
+    def configure(self, config: PreviewConfig):
+        """Tk thread'i: yeni ayarları ver; sonraki karede geçerli olur."""
+        self.config = config
+
+    def _apply(self, cfg: PreviewConfig):
+        self.monitor_idx = cfg.monitor_idx
+        self.monitor_indices = cfg.monitor_indices  # ızgara modu: birden çok monitör
+        self.roi_mode = cfg.roi_mode
+        self.roi = cfg.roi
+        self.roi_size = cfg.roi_size
+        self.scale = cfg.scale
+        self.fps = max(1, int(cfg.fps))
+        if (self.fps, cfg.adaptive_fps) != (self.scheduler.target_fps, self.scheduler.adaptive):
+            self.scheduler.set_target(self.fps, cfg.adaptive_fps)
+        self.show_cursor = cfg.show_cursor
+        self.debug = cfg.debug
+        self.arrow_len = int(cfg.arrow_len)
+        self.arrow_dir = cfg.arrow_dir
+        self.arrow_color_bgr = cfg.arrow_color_bgr
+        self.anchor_mode = cfg.anchor_mode
+        self.arrow_offset = int(cfg.arrow_offset)
+        if (cfg.click_highlight, cfg.cursor_trail) != (self.overlay.clicks, self.overlay.trail):
+            self.overlay.clicks = cfg.click_highlight
+            self.overlay.trail = cfg.cursor_trail
+            self.overlay.reset()
+        self.resizer.mode = cfg.resize_mode
+        self.pipeline_workers = max(0, int(cfg.pipeline_workers))  # 0 = tek thread
+        if hasattr(self, "profiler"):
+            # debug kapanınca başlangıçtaki duruma dön (profil kapalıysa bedelsiz)
+            self.profiler.enabled = cfg.debug or self._profile_enabled
+        self._applied = cfg
+
+    def _sync_config(self) -> bool:
+        """Bekleyen ayarları uygula; döngü yeniden kurulmalıysa True.
+
+        Monitör seçimi ya da ardışık düzen değişince döngü biter ve run()
+        aynı yakalama oturumuyla yeni düzende devam eder; diğer ayarlar
+        (FPS, ölçek, ok, kalite, ROI) aynı döngüde sonraki karede geçerlidir.
+        """
+        cfg = self.config
+        if cfg is self._applied:
+            return False
+        old = self._applied
+        self._apply(cfg)
+        return (cfg.monitors() != old.monitors() or cfg.pipelined() != old.pipelined()
+                or (cfg.pipelined() and cfg.pipeline_workers != old.pipeline_workers))
+
+    def _grab(self, source: CaptureSource, mon: Dict, W: int, H: int) -> Tuple[np.ndarray, float]:
+        if source.wants_out_buffer:
+            if self._grab_buf is None or self._grab_buf.shape != (H, W, 4):
+                self._grab_buf = np.empty((H, W, 4), dtype=np.uint8)
+            return source.grab(mon, self._grab_buf)
+        return source.grab(mon)
+
+    def _arrow_style(self) -> tuple:
+        return (self.arrow_len, self.arrow_offset, self.arrow_dir,
+                tuple(self.arrow_color_bgr), self.anchor_mode)
+
+    def _read_cursor(self, source: CaptureSource, L: int, T: int, W: int, H: int
+                     ) -> Tuple[Optional[Tuple[int,int,bool]], str]:
+        """İmleci bölgeye göre yerel koordinatta oku: ((cx, cy, inside) | None, debug)."""
+        if not self.show_cursor:
+            return None, ""
+        try:
+            cx, cy, inside, meta = source.cursor_in(L, T, W, H)
+        except Exception as e:
+            return None, (f"cursor_err:{e}" if self.debug else "")
+        dbg_text = ""
+        if self.debug:
+            cx_phys, cy_phys = meta.get("phys", (cx, cy))
+            dbg_text = (f"CUR:{cx_phys},{cy_phys} method={meta.get('method')} "
+                        f"MON:[{L},{T},{W},{H}] inside={inside} "
+                        f"anchor={self.anchor_mode} off={self.arrow_offset}")
+        return (int(cx), int(cy), inside), dbg_text
+
+    def _plan_overlay(self, pos: Optional[Tuple[int,int]], clip: Box, f: float) -> list:
+        """İmleç katmanlarını planla (sprite'lar önbellekten; çizim yok)."""
+        if not self.show_cursor:
+            return []
+        return self.overlay.plan(pos, clip, f, self._arrow_style(), time.perf_counter())
+
+    def run(self):
+        try:
+            with self.source as source:
+                # yakalama oturumu ve tamponlar düzen değişiklikleri boyunca korunur
+                while not self._stop_event.is_set():
+                    self._sync_config()
+                    cfg = self._applied
+                    monitors = source.monitors()
+                    indices = cfg.monitors()
+                    if any(i < 0 or i >= len(monitors) for i in indices):
+                        self.error = INVALID_MONITOR_ERROR
+                        return
+                    mons = [monitors[i] for i in indices]
+                    # eşzamanlı karelerde süreç geneli tepe bellek kareye atfedilemez
+                    self.profiler.alloc_paused = cfg.pipelined()
+                    if cfg.pipelined():
+                        self._run_pipelined(source, mons[0])
+                    else:
+                        self._run_serial(source, mons)
+        except Exception as e:
+            self.error = f"Hata: {e}"
+
+    def _roi_region(self, mon: Dict, cursor: Optional[Tuple[int,int,bool]]) -> Dict:
+        """ROI moduna göre yakalanacak bölge; kapalıysa `mon` nesnesinin kendisi.
+
+        "sabit": monitöre göre (x, y, w, h). "imleci takip": roi_size
+        boyutunda, merkezi imlece yumuşatılarak (EMA) yaklaşan pencere.
+        """
+        mode = self.roi_mode
+        MW, MH = mon["width"], mon["height"]
+        if mode == "sabit" and self.roi:
+            x, y, w, h = self.roi
+        elif mode == "imleci takip":
+            w, h = self.roi_size
+            if cursor is not None and cursor[2]:
+                c = self._roi_center
+                if c is None:
+                    self._roi_center = (float(cursor[0]), float(cursor[1]))
+                else:
+                    self._roi_center = (c[0] + ROI_SMOOTHING * (cursor[0] - c[0]),
+                                        c[1] + ROI_SMOOTHING * (cursor[1] - c[1]))
+            cx, cy = self._roi_center or (MW / 2, MH / 2)
+            x, y = int(round(cx - w / 2)), int(round(cy - h / 2))
+        else:
+            return mon
+        w = max(16, min(int(w), MW))
+        h = max(16, min(int(h), MH))
+        x = max(0, min(int(x), MW - w))
+        y = max(0, min(int(y), MH - h))
+        return {"left": mon["left"] + x, "top": mon["top"] + y, "width": w, "height": h}
+
+    def _run_serial(self, source: CaptureSource, mons: List[Dict]):
+        """Tek thread döngüsü; N monitör tek yakalamada ızgara olarak gösterilir.
+
+        Seçili monitörlerin kapsayan dikdörtgeni bir kez yakalanır, her
+        monitör bu karenin kopyasız bir dilimidir. Her karonun kendi ölçeği,
+        değişim dedektörü ve imleç oku vardır.
+        """
+        base = union_rect(mons)
+        BL, BT, BW, BH = base["left"], base["top"], base["width"], base["height"]
+        # her monitörün birleşik karedeki yeri (x0, y0, w, h)
+        base_views = [(m["left"] - BL, m["top"] - BT, m["width"], m["height"]) for m in mons]
+        seq = 0
+        tick = 0
+        detectors = [ChangeDetector() for _ in mons]
+        idle = 0                  # art arda içeriği değişmeyen tick sayısı
+        last_draws: list = []     # son karıştırılan imleç katmanları
+        last_arrow_box = None     # son katmanların kapsadığı alan (hedef koord.)
+        last_full = 0.0
+        last_layout = None
+        last_region = None
+
+        while not self._stop_event.is_set():
+            if self._sync_config():
+                return
+            self.scheduler.wait()
+            self.profiler.frame_begin()
+            tick += 1
+
+            # --- imleç (ucuz; her tick'te), monitör(ler)e göre ---
+            raw, dbg_text = self._read_cursor(source, BL, BT, BW, BH)
+
+            # --- yakalanacak bölge: tüm monitör(ler) ya da ROI (tek monitörde) ---
+            region = self._roi_region(base, raw) if len(mons) == 1 else base
+            L, T, W, H = region["left"], region["top"], region["width"], region["height"]
+            views = base_views if region is base else [(0, 0, W, H)]
+            moved = region != last_region
+            last_region = region
+            if raw is not None:
+                rx, ry = raw[0] - (L - BL), raw[1] - (T - BT)
+                raw = (rx, ry, raw[2] and 0 <= rx < W and 0 <= ry < H)
+
+            # tuval boyutu Tk thread'inde yayınlanır; burada yalnızca okunur
+            canvas_w, canvas_h = self.ui.canvas_size
+            # ROI büyüteç gibi davranır: tuvale sığacak kadar büyütülebilir
+            scale = ROI_MAX_ZOOM if region is not base and canvas_w > 0 else self.scale
+            (out_w, out_h), tiles = grid_layout([(w, h) for _, _, w, h in views],
+                                                scale, canvas_w, canvas_h)
+            resized = (out_w, out_h, tiles) != last_layout
+            if resized:
+                self._small_buf = np.zeros((out_h, out_w, 4), dtype=np.uint8)
+                last_layout = (out_w, out_h, tiles)
+
+            # imleç hangi karoda, kare koordinatında nerede -> katman planı
+            pos, tile = None, 0
+            if raw is not None and raw[2]:
+                for i, ((vx, vy, vw, vh), (ox, oy, tw, th)) in enumerate(zip(views, tiles)):
+                    if vx <= raw[0] < vx + vw and vy <= raw[1] < vy + vh:
+                        pos = (ox + int((raw[0] - vx) * tw / vw), oy + int((raw[1] - vy) * th / vh))
+                        tile = i
+                        break
+            draws = self._plan_overlay(pos, tiles[tile], tiles[tile][2] / views[tile][2])
+
+            # --- yakalama (BGRA) + karo başına değişim tespiti ---
+            # ekran uzun süre durağansa yalnızca her IDLE_GRAB_EVERY tick'te bir yakala
+            t0 = time.perf_counter()
+            if not (resized or moved) and idle >= self.scheduler.fps and tick % IDLE_GRAB_EVERY:
+                img, ts = None, t0
+                tile_rects: List = [[] for _ in views]
+            else:
+                img, ts = self._grab(source, region, W, H)
+                full = resized or moved
+                # periyodik tazeleme: örneklemenin kaçırdığı değişiklik varsa karo tamamen
+                # yenilenir; tam çözünürlükte fark yoksa hiçbir şey gönderilmez
+                recheck = not full and t0 - last_full >= FULL_REFRESH_S
+                if full or recheck:
+                    last_full = t0
+                tile_rects = []
+                for det, (vx, vy, vw, vh) in zip(detectors, views):
+                    view = img[vy:vy + vh, vx:vx + vw]
+                    rects = det.diff(view)
+                    # tam yenilemede yalnızca referans tazelenir (sonuç kullanılmaz)
+                    if (full or recheck) and det.changed_since_check(view) and recheck:
+                        rects = None
+                    tile_rects.append(None if full else rects)
+            t1 = time.perf_counter()
+            self.profiler.add("grab", t1 - t0)
+            if img is not None:
+                self.profiler.count("captured")
+
+            unchanged = all(r == [] for r in tile_rects)
+            if unchanged and draws == last_draws:
+                idle += 1
+                self.profiler.count("unchanged")
+                continue  # hiçbir şey değişmedi: dönüşüm ve UI güncellemesi yok
+            idle = idle + 1 if unchanged else 0
+
+            # --- erken küçültme: her karoda yalnızca kirli bölgeler ---
+            dirty: Optional[List[Tuple[int,int,int,int]]] = []
+            if img is not None:
+                preset = self.resizer.select(sum(w * h for _, _, w, h in views),
+                                             sum(w * h for _, _, w, h in tiles),
+                                             1.0 / self.scheduler.target_fps)
+                px = 0
+                for rects, (vx, vy, vw, vh), (ox, oy, tw, th) in zip(tile_rects, views, tiles):
+                    if rects == []:
+                        continue
+                    done, n = update_small(img[vy:vy + vh, vx:vx + vw], rects,
+                                           self._small_buf[oy:oy + th, ox:ox + tw], preset)
+                    px += n
+                    if done is None:
+                        done = [(0, 0, tw, th)]
+                    dirty += [(x0 + ox, y0 + oy, x1 + ox, y1 + oy) for x0, y0, x1, y1 in done]
+                if resized:
+                    dirty = None
+            t2 = time.perf_counter()
+            if img is not None:
+                self.resizer.observe(preset, px, t2 - t1)
+                if self.resizer.pending_probe:
+                    vx, vy, vw, vh = views[0]
+                    self.resizer.run_probe(img[vy:vy + vh, vx:vx + vw], tiles[0][2], tiles[0][3])
+                    t2 = time.perf_counter()
+            self.profiler.add("resize", t2 - t1)
+
+            # --- küçük kare üzerinde BGRA -> RGB, havuz tamponuna ---
+            rgb = self.pool.acquire((out_h, out_w, 3))
+            cv2.cvtColor(self._small_buf, cv2.COLOR_BGRA2RGB, dst=rgb)
+            t3 = time.perf_counter()
+            self.profiler.add("convert", t3 - t2)
+
+            # --- imleç katmanları (imlecin karosunda, küçük RGB üzerinde) ---
+            arrow_box = CursorOverlay.compose(rgb, draws)
+            if dirty is not None:
+                dirty += [b for b in (last_arrow_box, arrow_box) if b is not None]
+            last_draws, last_arrow_box = draws, arrow_box
+            self.profiler.add("overlay", time.perf_counter() - t3)
+
+            seq += 1
+            src_rect = (L - BL, T - BT, W, H) if len(mons) == 1 else None
+            self._publish(Frame(rgb, seq, ts, self.pool, dirty, src_rect))
+            self.profiler.frame_end(seq, ts)
+
+            if self.debug:
+                self.status_text = (f"DEBUG: {dbg_text} | {self.scheduler.summary()} "
+                                    f"| {self.resizer.summary()} "
+                                    f"| {self.profiler.summary()} | {self.mailbox.counters()}")
+
+    # ---- ardışık düzen (capture -> process havuzu -> present) ----
+    def _run_pipelined(self, source: CaptureSource, mon: Dict):
+        """Yakalama bu thread'de; işleme thread havuzunda; sunum ayrı thread'de.
+
+        Aşamalar sınırlı kuyrukla bağlıdır. İşleme geride kalırsa yeni kare
+        kuyruğa girmeden düşürülür. Sunum aşaması future'ları gönderim
+        sırasıyla beklediği için sıra numaraları korunur.
+        """
+        L, T, W, H = mon["left"], mon["top"], mon["width"], mon["height"]
+        seq = 0
+        detector = ChangeDetector()
+        grab_pool = FrameBufferPool() if source.wants_out_buffer else None
+        pending: "queue.Queue[Optional[Future]]" = queue.Queue(maxsize=self.pipeline_workers + 1)
+        presenter = threading.Thread(target=self._present_stage, args=(pending,),
+                                     name="preview-present", daemon=True)
+        presenter.start()
+        last_draws: list = []
+        last_size = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.pipeline_workers,
+                                    thread_name_prefix="preview-proc") as executor:
+                while not self._stop_event.is_set():
+                    if self._sync_config():
+                        break
+                    self.scheduler.wait()
+
+                    canvas_w, canvas_h = self.ui.canvas_size
+                    tw, th = fit_size(W, H, self.scale, canvas_w, canvas_h)
+                    fx, fy = tw / W, th / H
+                    cursor, dbg_text = self._read_cursor(source, L, T, W, H)
+                    pos = (int(cursor[0] * fx), int(cursor[1] * fy)) \
+                        if cursor is not None and cursor[2] else None
+                    draws = self._plan_overlay(pos, (0, 0, tw, th), fx)
+
+                    t0 = time.perf_counter()
+                    buf = grab_pool.acquire((H, W, 4)) if grab_pool else None
+                    img, ts = source.grab(mon, buf) if buf is not None else source.grab(mon)
+                    grab_s = time.perf_counter() - t0
+                    self.profiler.count("captured")
+
+                    rects = detector.diff(img)
+                    if rects == [] and draws == last_draws and (tw, th) == last_size:
+                        if grab_pool:
+                            grab_pool.release(img)
+                        self.profiler.count("unchanged")
+                        continue
+                    if pending.full():
+                        # işleme aşaması dolu: kareyi düşür, sonraki kare tam işlensin
+                        if grab_pool:
+                            grab_pool.release(img)
+                        detector.reset()
+                        self.mailbox.capture_dropped += 1
+                        self.profiler.count("dropped_capture")
+                        continue
+                    last_draws, last_size = draws, (tw, th)
+
+                    seq += 1
+                    # işleme thread'leri paralel çalıştığı için kare bütçesi işçi sayısıyla çarpılır
+                    preset = self.resizer.select(W * H, tw * th, self.pipeline_workers
+                                                 / self.scheduler.target_fps)
+                    pending.put(executor.submit(self._process_job, img, grab_pool,
+                                                draws, seq, ts, tw, th, grab_s, preset))
+
+                    if self.debug:
+                        self.status_text = (f"DEBUG: {dbg_text} | {self.scheduler.summary()} "
+                                            f"| {self.resizer.summary()} "
+                                            f"| {self.profiler.summary()} | {self.mailbox.counters()}")
+        finally:
+            pending.put(None)
+            presenter.join()
+
+    def _process_job(self, img: np.ndarray, grab_pool: Optional[FrameBufferPool],
+                     draws: list, seq: int, ts: float,
+                     tw: int, th: int, grab_s: float = 0.0, preset: str = "dengeli") -> Frame:
+        """Havuz thread'i: küçült + BGRA->RGB + imleç katmanları (cv2 GIL'i bırakır)."""
+        H, W = img.shape[:2]
+        self.profiler.frame_begin()
+        self.profiler.add("grab", grab_s)
+        t0 = time.perf_counter()
+        rgb = self.pool.acquire((th, tw, 3))
+        try:
+            if (tw, th) != (W, H):
+                small = self._small_pool.acquire((th, tw, 4))
+                resize_bgra(img, small, preset)
+                self.resizer.observe(preset, W * H, time.perf_counter() - t0)
+                if self.resizer.pending_probe:
+                    self.resizer.run_probe(img, tw, th)
+                t1 = time.perf_counter()
+                cv2.cvtColor(small, cv2.COLOR_BGRA2RGB, dst=rgb)
+                self._small_pool.release(small)
+            else:
+                t1 = time.perf_counter()
+                cv2.cvtColor(img, cv2.COLOR_BGRA2RGB, dst=rgb)
+        finally:
+            if grab_pool:
+                grab_pool.release(img)
+        t2 = time.perf_counter()
+        CursorOverlay.compose(rgb, draws)
+        self.profiler.add("resize", t1 - t0)
+        self.profiler.add("convert", t2 - t1)
+        self.profiler.add("overlay", time.perf_counter() - t2)
+        self.profiler.frame_end(seq, ts)
+        return Frame(rgb, seq, ts, self.pool, src_rect=(0, 0, W, H))
+
+    def _present_stage(self, pending: "queue.Queue[Optional[Future]]"):
+        while True:
+            fut = pending.get()
+            if fut is None:
+                return
+            try:
+                frame = fut.result()
+            except Exception as e:
+                self.error = f"Hata: {e}"
+                self.stop()
+                continue
+            self._publish(frame)
+
+# --- süreç yalıtımlı yakalama (paylaşımlı bellek halkası) --------------------
+RING_MAGIC = 0x4D50524E
+RING_HEADER = 8          # int64: magic, slots, slot_bytes, latest, canvas_w, canvas_h
+RING_MAX_RECTS = 16      # yuva başına taşınan kirli alan; fazlası "tamamı" sayılır
+# int64: begin, end, h, w, seq, ts_ns, ndirty, has_src, src_rect (4), rects
+RING_RECTS_AT = 12
+RING_META = RING_RECTS_AT + 4 * RING_MAX_RECTS
+
+class SharedFrameRing:
+    """multiprocessing.shared_memory üzerinde sabit yuvalı RGB kare halkası.
+
+    Tek yazıcı (alt süreç), tek okuyucu (uygulama). Yazıcı kareyi sıradaki
+    yuvaya kopyalar ve yuvayı begin/end sıra sayaçlarıyla çevreler (seqlock);
+    okuyucu yalnızca en yeni yuvayı okur ve kopyalama sırasında yuvanın
+    üzerine yazıldıysa kareyi atar. Kareler pickle edilmez.
+    Tuval boyutu da başlıkta ters yönde (uygulama -> alt süreç) taşınır.
+    """
+    def __init__(self, name: Optional[str] = None, slots: int = 3,
+                 slot_bytes: int = 0, create: bool = False):
+        from multiprocessing import shared_memory
+        if create:
+            size = (RING_HEADER + slots * RING_META) * 8 + slots * slot_bytes
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        buf = self.shm.buf
+        self.header = np.ndarray((RING_HEADER,), dtype=np.int64, buffer=buf)
+        if create:
+            self.header[:] = 0
+            self.header[:3] = (RING_MAGIC, slots, slot_bytes)
+        elif self.header[0] != RING_MAGIC:
+            raise RuntimeError(f"Geçersiz kare halkası: {name}")
+        self.slots, self.slot_bytes = int(self.header[1]), int(self.header[2])
+        self.meta = np.ndarray((self.slots, RING_META), dtype=np.int64, buffer=buf,
+                               offset=RING_HEADER * 8)
+        self.data = np.ndarray((self.slots, self.slot_bytes), dtype=np.uint8, buffer=buf,
+                               offset=(RING_HEADER + self.slots * RING_META) * 8)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def canvas_size(self) -> Tuple[int, int]:
+        return int(self.header[4]), int(self.header[5])
+
+    @canvas_size.setter
+    def canvas_size(self, size: Tuple[int, int]):
+        self.header[4], self.header[5] = size
+
+    def write(self, rgb: np.ndarray, seq: int, ts: float,
+              dirty: Optional[List[Tuple[int,int,int,int]]],
+              src_rect: Optional[Tuple[int,int,int,int]] = None) -> bool:
+        """Kareyi sıradaki yuvaya yaz; yuvaya sığmıyorsa False."""
+        h, w = rgb.shape[:2]
+        nbytes = h * w * 3
+        if nbytes > self.slot_bytes:
+            return False
+        n = int(self.header[3]) + 1
+        slot = n % self.slots
+        m = self.meta[slot]
+        m[0] = n                                   # yazım başladı
+        np.copyto(self.data[slot, :nbytes].reshape(h, w, 3), rgb)
+        m[2:6] = (h, w, seq, int(ts * 1e9))
+        if dirty is None or len(dirty) > RING_MAX_RECTS:
+            m[6] = -1
+        else:
+            m[6] = len(dirty)
+            if dirty:
+                m[RING_RECTS_AT:RING_RECTS_AT + 4 * len(dirty)] = \
+                    np.asarray(dirty, dtype=np.int64).reshape(-1)
+        m[7] = src_rect is not None
+        if src_rect is not None:
+            m[8:12] = src_rect
+        m[1] = n                                   # yazım bitti
+        self.header[3] = n
+        return True
+
+    def read_latest(self, last: int, pool: FrameBufferPool):
+        """En yeni kareyi havuz tamponuna kopyala: (rgb, seq, ts, dirty, src_rect, n) ya da None.
+
+        `last` okuyucunun en son aldığı halka sırasıdır; arada kare
+        kaçırıldıysa kirli alanlar bilinmediğinden dirty=None döner.
+        """
+        n = int(self.header[3])
+        if n == last:
+            return None
+        slot = n % self.slots
+        m = self.meta[slot]
+        if m[1] != n:
+            return None
+        h, w, seq, ts_ns, ndirty, has_src = (int(v) for v in m[2:8])
+        rgb = pool.acquire((h, w, 3))
+        np.copyto(rgb, self.data[slot, :h * w * 3].reshape(h, w, 3))
+        dirty = None
+        if ndirty >= 0 and n == last + 1:
+            dirty = [tuple(int(v) for v in r)
+                     for r in m[RING_RECTS_AT:RING_RECTS_AT + 4 * ndirty].reshape(-1, 4)]
+        src_rect = tuple(int(v) for v in m[8:12]) if has_src else None
+        if m[0] != n:
+            pool.release(rgb)   # kopyalarken üzerine yazıldı
+            return None
+        return rgb, seq, ts_ns / 1e9, dirty, src_rect, n
+
+    def close(self):
+        # numpy görünümleri bırakılmadan paylaşımlı bellek kapanmaz
+        self.header = self.meta = self.data = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+class _RingView:
+    """Alt süreçteki worker için UI yerine geçen nesne: tuval boyutu halkadan."""
+    def __init__(self, ring: SharedFrameRing):
+        self.ring = ring
+
+    @property
+    def canvas_size(self) -> Tuple[int, int]:
+        return self.ring.canvas_size
+
+class _RingWorker(PreviewWorker):
+    """Alt süreçte çalışan worker: kareleri teslim kutusu yerine halkaya yazar."""
+    def __init__(self, ring: SharedFrameRing, **kwargs):
+        super().__init__(_RingView(ring), **kwargs)
+        self.ring = ring
+        self.ring_needed = 0    # kare yuvaya sığmadıysa gereken bayt
+
+    def _publish(self, frame: Frame):
+        if not self.ring.write(frame.rgb, frame.seq, frame.ts, frame.dirty, frame.src_rect):
+            self.ring_needed = frame.rgb.nbytes
+            self.stop()
+        frame.release()
+
+# alt süreç çıkış kodları
+EXIT_CRASH, EXIT_FATAL, EXIT_GROW = 1, 2, 3
+
+def _capture_process_main(ring_name: str, backend: str, backend_opts: Dict,
+                          config: Dict, profile: Tuple[bool, bool], cmd_q, status_q):
+    """Alt süreç girişi: yakalama + işleme, kareler paylaşımlı belleğe.
+
+    `profile` = (açık, bellek izi). Açıksa kare satırları durum mesajlarıyla
+    ana sürece gönderilir (aşama süreleri ve iz orada birleşir).
+    """
+    ring = SharedFrameRing(ring_name)
+    code = 0
+    try:
+        profiler = PipelineProfiler(enabled=profile[0], trace=profile[0],
+                                    track_alloc=profile[1])
+        worker = _RingWorker(ring, source=make_capture_source(backend, **backend_opts),
+                             profiler=profiler, **config)
+        worker.start()
+        parent = multiprocessing.parent_process()
+        next_status = 0.0
+
+        def send_status():
+            status_q.put(("status", worker.scheduler.summary(), worker.status_text,
+                          worker.mailbox.capture_dropped, profiler.take_rows()))
+        while worker.is_alive():
+            try:
+                cmd = cmd_q.get(timeout=0.2)
+            except queue.Empty:
+                cmd = None
+            if cmd is not None and cmd[0] == "config":
+                worker.configure(PreviewConfig(**cmd[1]))
+            elif cmd is not None and cmd[0] == "stop":
+                worker.stop()
+            if parent is not None and not parent.is_alive():
+                worker.stop()
+            now = time.perf_counter()
+            if now >= next_status:
+                next_status = now + 1.0
+                send_status()
+        worker.join()
+        profiler.close()
+        send_status()   # son satırlar
+        if worker.ring_needed:
+            status_q.put(("grow", worker.ring_needed))
+            code = EXIT_GROW
+        elif worker.error:
+            status_q.put(("error", worker.error))
+            code = EXIT_FATAL if worker.error == INVALID_MONITOR_ERROR else EXIT_CRASH
+    except Exception as e:
+        status_q.put(("error", f"Hata: {e}"))
+        code = EXIT_CRASH
+    finally:
+        ring.close()
+    sys.exit(code)
+
+class _RemoteSummary:
+    """Alt süreçten gelen zamanlayıcı özeti (FrameScheduler.summary() yerine)."""
+    def __init__(self):
+        self.text = "alt süreç başlatılıyor..."
+
+    def summary(self) -> str:
+        return self.text
+
+class ProcessCaptureWorker(threading.Thread):
+    """PreviewWorker ile aynı arayüz; yakalama ve işleme ayrı bir süreçte.
+
+    Alt süreç kareleri SharedFrameRing'e yazar, bu thread en yeni yuvayı
+    okuyup teslim kutusuna (ve varsa kayıt/yayına) verir. Ayarlar kuyrukla
+    gönderilir. Alt süreç çökerse kısa bir beklemeyle yeniden başlatılır;
+    RESTART_WINDOW_S içinde MAX_RESTARTS'tan fazla çökerse durulur. Kare
+    yuvaya sığmazsa halka büyütülerek yeniden başlatılır.
+    """
+    SLOTS = 3
+    MAX_RESTARTS = 5
+    RESTART_WINDOW_S = 30.0
+
+    def __init__(self, ui, backend: str = "mss", backend_opts: Optional[Dict] = None,
+                 config: Optional[PreviewConfig] = None,
+                 profiler: Optional[PipelineProfiler] = None):
+        super().__init__(daemon=True)
+        self.ui = ui
+        self.backend = backend
+        self.backend_opts = backend_opts or {}
+        self.config = config or PreviewConfig()
+        self.profiler = profiler or PipelineProfiler()
+        self._profile_enabled = self.profiler.enabled
+        self.profiler.enabled = self._profile_enabled or self.config.debug
+        self.scheduler = _RemoteSummary()
+        self.pool = FrameBufferPool()
+        self.mailbox = FrameMailbox()
+        self.recorder: Optional[FrameRecorder] = None
+        self.streamer: Optional[PreviewStreamServer] = None
+        self.status_text = ""
+        self.error: Optional[str] = None
+        self.restarts = 0
+        self._dropped_base = 0   # önceki alt süreçlerin yakalama tarafı düşüşleri
+        self._cmd_q = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop_event = threading.Event()
+
+    _publish = PreviewWorker._publish
+
+    @property
+    def debug(self) -> bool:
+        return self.config.debug
+
+    def stop(self):
+        self._stop_event.set()
+
+    def configure(self, config: PreviewConfig):
+        self.config = config
+        self.profiler.enabled = self._profile_enabled or config.debug
+        cmd_q = self._cmd_q
+        if cmd_q is not None:
+            cmd_q.put(("config", config.as_dict()))
+
+    def run(self):
+        w, h = self.ui.canvas_size
+        slot_bytes = max(w * h, 1920 * 1080) * 3
+        crashes: deque = deque()
+        try:
+            while not self._stop_event.is_set():
+                ring = SharedFrameRing(slots=self.SLOTS, slot_bytes=slot_bytes, create=True)
+                try:
+                    reason, info = self._run_child(ring)
+                finally:
+                    ring.close()
+                    ring.unlink()
+                if reason == "stopped":
+                    break
+                if reason == "grow":
+                    slot_bytes = int(info * 1.25)
+                    continue
+                if reason == "fatal":
+                    self.error = info
+                    break
+                now = time.perf_counter()
+                crashes.append(now)
+                while crashes and now - crashes[0] > self.RESTART_WINDOW_S:
+                    crashes.popleft()
+                if len(crashes) > self.MAX_RESTARTS:
+                    self.error = f"Yakalama süreci tekrar tekrar çöktü: {info}"
+                    break
+                self.restarts += 1
+                self.scheduler.text = f"yakalama süreci yeniden başlatılıyor ({info})"
+                self._stop_event.wait(0.5 * len(crashes))
+        except Exception as e:
+            self.error = f"Hata: {e}"
+
+    def _run_child(self, ring: SharedFrameRing) -> Tuple[str, object]:
+        """Bir alt süreç ömrü: okuma döngüsü + denetim; (neden, bilgi) döndürür."""
+        cmd_q, status_q = self._ctx.Queue(), self._ctx.Queue()
+        ring.canvas_size = self.ui.canvas_size
+        proc = self._ctx.Process(
+            target=_capture_process_main, name="preview-capture", daemon=True,
+            args=(ring.name, self.backend, self.backend_opts, self.config.as_dict(),
+                  (self._profile_enabled, self.profiler.track_alloc), cmd_q, status_q))
+        proc.start()
+        self._cmd_q = cmd_q
+        last = 0
+        notes = {"error": "", "grow": 0}
+        self._dropped_base = self.mailbox.capture_dropped
+
+        def drain():
+            while True:
+                try:
+                    msg = status_q.get_nowait()
+                except queue.Empty:
+                    return
+                if msg[0] == "status":
+                    text = msg[1]
+                    if self.restarts:
+                        text += f" | süreç yeniden başlatma {self.restarts}"
+                    self.scheduler.text, self.status_text = text, msg[2]
+                    # yalnızca bu thread yazar (FrameMailbox.capture_dropped)
+                    self.mailbox.capture_dropped = self._dropped_base + msg[3]
+                    self.profiler.merge(msg[4])
+                else:
+                    notes[msg[0]] = msg[1]
+        try:
+            while True:
+                ring.canvas_size = self.ui.canvas_size
+                t0 = time.perf_counter()
+                got = ring.read_latest(last, self.pool)
+                if got is not None:
+                    rgb, seq, ts, dirty, src_rect, last = got
+                    self.profiler.add("ring_read", time.perf_counter() - t0)
+                    self._publish(Frame(rgb, seq, ts, self.pool, dirty, src_rect))
+                else:
+                    time.sleep(min(0.004, 0.5 / max(1, self.config.fps)))
+                drain()
+
+                if self._stop_event.is_set():
+                    cmd_q.put(("stop",))
+                    # son durum mesajı okunmadan alt süreç kuyruğunu boşaltıp çıkamaz
+                    t_end = time.perf_counter() + 2.0
+                    while proc.is_alive() and time.perf_counter() < t_end:
+                        drain()
+                        proc.join(0.05)
+                    drain()
+                    return "stopped", None
+                if not proc.is_alive():
+                    proc.join()
+                    time.sleep(0.05)   # çıkmadan hemen önce gönderilen mesaj
+                    drain()
+                    code = proc.exitcode
+                    if code == EXIT_GROW and notes["grow"]:
+                        return "grow", notes["grow"]
+                    if code == EXIT_FATAL:
+                        return "fatal", notes["error"]
+                    if code == 0:
+                        return "stopped", None
+                    return "crash", notes["error"] or f"çıkış kodu {code}"
+        finally:
+            self._cmd_q = None
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(1.0)
+            for q in (cmd_q, status_q):
+                q.cancel_join_thread()
+                q.close()
+
+# --- GUI ----------------------------------------------------------------------
+PARTIAL_MAX_RECTS = 8      # bundan fazla kirli alan varsa tam paste
+PARTIAL_MAX_AREA = 0.4     # kirli alan karenin bu oranını aşarsa tam paste
+
+class App:
+    def __init__(self, root: tk.Tk, backend: str = "mss",
+                 backend_opts: Optional[Dict[str, Dict]] = None,
+                 profile: bool = False, trace_path: Optional[str] = None,
+                 record_path: Optional[str] = None, drop_policy: str = "eskiyi at",
+                 serve: Optional[str] = None, stream_fps: int = 15,
+                 process: bool = False, profile_alloc: bool = False):
+        self.root = root
+        self.backend_opts = backend_opts or {}
+        self.trace_path = trace_path
+        self.record_path = record_path   # verildiyse önizleme başlarken kayıt da başlar
+        self.profiler: Optional[PipelineProfiler] = None
+        self.recorder: Optional[FrameRecorder] = None
+        self.streamer: Optional[PreviewStreamServer] = None
+        self.stream_fps = stream_fps
+        root.title(APP_TITLE)
+        root.geometry("1120x680")
+        root.minsize(860, 520)
+
+        self.worker: Optional[PreviewWorker] = None
+        self.is_running = False
+        self.photo_ref = None
+        self.canvas_size = (0, 0)   # worker'a yayınlanan anlık görüntü (atomik tuple)
+        self._poll_id = None
+        self._status_ts = 0.0
+
+        # ÜST PANEL
+        top = ttk.Frame(root, padding=8)
+        top.pack(side=tk.TOP, fill=tk.X)
+
+        ttk.Label(top, text="Monitör:").pack(side=tk.LEFT, padx=(0,6))
+        self.backend_var = tk.StringVar(value=backend)
+        # monitör listesi pencere açıldıktan sonra arka planda doldurulur
+        self.monitors: List[Dict] = []
+        self.monitor_opts = ["Monitörler yükleniyor..."]
+        self.monitor_var = tk.StringVar(value=self.monitor_opts[0])
+        self.monitor_combo = ttk.Combobox(top, values=self.monitor_opts,
+                                          textvariable=self.monitor_var, state="readonly", width=48)
+        self.monitor_combo.pack(side=tk.LEFT)
+        ttk.Button(top, text="Yenile", command=self.refresh_monitors).pack(side=tk.LEFT, padx=6)
+
+        ttk.Label(top, text="Ölçek:").pack(side=tk.LEFT, padx=(10,6))
+        self.scale_var = tk.DoubleVar(value=0.5)
+        ttk.Spinbox(top, from_=0.1, to=1.5, increment=0.05,
+                    textvariable=self.scale_var, width=6).pack(side=tk.LEFT)
+
+        ttk.Label(top, text="FPS:").pack(side=tk.LEFT, padx=(10,6))
+        self.fps_var = tk.IntVar(value=30)
+        ttk.Spinbox(top, values=(15,20,24,30,45,60),
+                    textvariable=self.fps_var, width=6).pack(side=tk.LEFT)
+        self.adaptive_fps_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Uyarlanabilir",
+                        variable=self.adaptive_fps_var).pack(side=tk.LEFT, padx=(6,0))
+
+        self.topmost_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Hep üstte",
+                        variable=self.topmost_var, command=self.on_topmost).pack(side=tk.LEFT, padx=(10,6))
+
+        self.cursor_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top, text="İmleci Göster",
+                        variable=self.cursor_var).pack(side=tk.LEFT, padx=(6,6))
+
+        self.debug_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="Debug",
+                        variable=self.debug_var).pack(side=tk.LEFT)
+
+        # ORTA PANEL — OK AYARLARI
+        mid = ttk.Frame(root, padding=(8,0,8,8))
+        mid.pack(side=tk.TOP, fill=tk.X)
+
+        ttk.Label(mid, text="Ok Boyu:").pack(side=tk.LEFT)
+        self.arrow_len_var = tk.IntVar(value=24)
+        ttk.Spinbox(mid, from_=8, to=200, increment=2,
+                    textvariable=self.arrow_len_var, width=6).pack(side=tk.LEFT, padx=(6,12))
+
+        ttk.Label(mid, text="Ok Yönü:").pack(side=tk.LEFT)
+        self.arrow_dir_var = tk.StringVar(value="sağ")
+        ttk.Combobox(mid, textvariable=self.arrow_dir_var, state="readonly",
+                     values=list(ARROW_VECTORS), width=18).pack(side=tk.LEFT, padx=(6,12))
+
+        ttk.Label(mid, text="Bağlantı:").pack(side=tk.LEFT)
+        self.anchor_mode_var = tk.StringVar(value="dışarıdan uca çiz")
+        ttk.Combobox(mid, textvariable=self.anchor_mode_var, state="readonly",
+                     values=ANCHOR_MODES, width=18).pack(side=tk.LEFT, padx=(6,12))
+
+        ttk.Label(mid, text="Ofset:").pack(side=tk.LEFT)
+        self.arrow_offset_var = tk.IntVar(value=0)
+        ttk.Spinbox(mid, from_=-60, to=120, increment=2,
+                    textvariable=self.arrow_offset_var, width=6).pack(side=tk.LEFT, padx=(6,12))
+
+        ttk.Label(mid, text="Ok Rengi:").pack(side=tk.LEFT)
+        self.arrow_color_hex = tk.StringVar(value="#FF0000")  # kırmızı
+        self.color_btn = ttk.Button(mid, text="Renk Seç", command=self.pick_color)
+        self.color_btn.pack(side=tk.LEFT, padx=(6,6))
+        self.color_preview = tk.Canvas(mid, width=28, height=18, bg="#FF0000",
+                                       highlightthickness=1, highlightbackground="#888")
+        self.color_preview.pack(side=tk.LEFT)
+
+        self.click_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(mid, text="Tıklama",
+                        variable=self.click_var).pack(side=tk.LEFT, padx=(12,6))
+        self.trail_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(mid, text="İz", variable=self.trail_var).pack(side=tk.LEFT)
+
+        # BUTONLAR
+        btns = ttk.Frame(root, padding=(8,0,8,8))
+        btns.pack(side=tk.TOP, fill=tk.X)
+        self.start_btn = ttk.Button(btns, text="Önizlemeyi Başlat", command=self.start_preview,
+                                    state=tk.DISABLED)   # monitörler gelince açılır
+        self.stop_btn  = ttk.Button(btns,  text="Durdur",            command=self.stop_preview, state=tk.DISABLED)
+        self.start_btn.pack(side=tk.LEFT)
+        self.stop_btn.pack(side=tk.LEFT, padx=6)
+
+        ttk.Label(btns, text="Kaynak:").pack(side=tk.LEFT, padx=(10,6))
+        backend_combo = ttk.Combobox(btns, textvariable=self.backend_var, state="readonly",
+                                     values=list(CAPTURE_BACKENDS), width=12)
+        backend_combo.pack(side=tk.LEFT)
+        backend_combo.bind("<<ComboboxSelected>>", lambda _e: self.refresh_monitors())
+
+        ttk.Label(btns, text="Kalite:").pack(side=tk.LEFT, padx=(10,6))
+        self.resize_mode_var = tk.StringVar(value="otomatik")
+        ttk.Combobox(btns, textvariable=self.resize_mode_var, state="readonly",
+                     values=RESIZE_MODES, width=14).pack(side=tk.LEFT)
+
+        self.pipeline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btns, text="Ardışık düzen",
+                        variable=self.pipeline_var).pack(side=tk.LEFT, padx=(10,6))
+        self.process_var = tk.BooleanVar(value=process)
+        ttk.Checkbutton(btns, text="Ayrı süreç",
+                        variable=self.process_var).pack(side=tk.LEFT, padx=(4,6))
+
+        self.grid_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btns, text="Izgara:",
+                        variable=self.grid_var).pack(side=tk.LEFT, padx=(10,4))
+        self.grid_monitors_var = tk.StringVar(value="1,2")
+        ttk.Entry(btns, textvariable=self.grid_monitors_var, width=10).pack(side=tk.LEFT)
+
+        self.profile_var = tk.BooleanVar(value=profile)
+        ttk.Checkbutton(btns, text="Profil",
+                        variable=self.profile_var).pack(side=tk.LEFT, padx=(10,4))
+        self.profile_alloc_var = tk.BooleanVar(value=profile_alloc)
+        ttk.Checkbutton(btns, text="Bellek",   # tracemalloc: yavaş, yalnızca gerekince
+                        variable=self.profile_alloc_var).pack(side=tk.LEFT, padx=(0,4))
+        ttk.Button(btns, text="İz Kaydet", command=self.export_trace).pack(side=tk.LEFT)
+        self.partial_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(btns, text="Kısmi çizim",
+                        variable=self.partial_var).pack(side=tk.LEFT, padx=(10,4))
+
+        # BÖLGE (ROI)
+        roi_row = ttk.Frame(root, padding=(8,0,8,8))
+        roi_row.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(roi_row, text="Bölge:").pack(side=tk.LEFT)
+        self.roi_mode_var = tk.StringVar(value="kapalı")
+        roi_combo = ttk.Combobox(roi_row, textvariable=self.roi_mode_var, state="readonly",
+                                 values=ROI_MODES, width=14)
+        roi_combo.pack(side=tk.LEFT, padx=(6,12))
+        roi_combo.bind("<<ComboboxSelected>>", lambda _e: self.apply_roi())
+        ttk.Label(roi_row, text="Sabit (x,y,w,h):").pack(side=tk.LEFT)
+        self.roi_rect_var = tk.StringVar(value="0,0,640,360")
+        roi_entry = ttk.Entry(roi_row, textvariable=self.roi_rect_var, width=18)
+        roi_entry.pack(side=tk.LEFT, padx=(6,12))
+        roi_entry.bind("<Return>", lambda _e: self.apply_roi())
+        ttk.Label(roi_row, text="Takip boyutu:").pack(side=tk.LEFT)
+        self.roi_size_var = tk.StringVar(value="640x360")
+        size_entry = ttk.Entry(roi_row, textvariable=self.roi_size_var, width=10)
+        size_entry.pack(side=tk.LEFT, padx=(6,12))
+        size_entry.bind("<Return>", lambda _e: self.apply_roi())
+        ttk.Label(roi_row, text="(önizlemede sürükleyerek de seçilebilir)").pack(side=tk.LEFT)
+
+        # KAYIT
+        rec_row = ttk.Frame(root, padding=(8,0,8,8))
+        rec_row.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(rec_row, text="Kayıt:").pack(side=tk.LEFT)
+        self.record_fmt_var = tk.StringVar(value="video")
+        ttk.Combobox(rec_row, textvariable=self.record_fmt_var, state="readonly",
+                     values=RECORD_FORMATS, width=8).pack(side=tk.LEFT, padx=(6,12))
+        ttk.Label(rec_row, text="Kuyruk dolunca:").pack(side=tk.LEFT)
+        self.drop_policy_var = tk.StringVar(value=drop_policy)
+        ttk.Combobox(rec_row, textvariable=self.drop_policy_var, state="readonly",
+                     values=DROP_POLICIES, width=10).pack(side=tk.LEFT, padx=(6,12))
+        self.record_btn = ttk.Button(rec_row, text="Kaydı Başlat", command=self.toggle_record)
+        self.record_btn.pack(side=tk.LEFT)
+
+        ttk.Label(rec_row, text="Yayın (adres:port):").pack(side=tk.LEFT, padx=(20,6))
+        self.stream_addr_var = tk.StringVar(value=serve or "127.0.0.1:8765")
+        ttk.Entry(rec_row, textvariable=self.stream_addr_var, width=16).pack(side=tk.LEFT)
+        self.stream_btn = ttk.Button(rec_row, text="Yayını Başlat", command=self.toggle_stream)
+        self.stream_btn.pack(side=tk.LEFT, padx=(6,6))
+        self.stream_url_var = tk.StringVar(value="")
+        ttk.Label(rec_row, textvariable=self.stream_url_var).pack(side=tk.LEFT)
+
+        # ÖNİZLEME
+        self.canvas = tk.Canvas(root, bg="black")
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0,8))
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.canvas.bind("<ButtonPress-1>", self.on_roi_press)
+        self.canvas.bind("<B1-Motion>", self.on_roi_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_roi_release)
+        self._view = None        # (x, y, img_w, img_h, src_rect): tuvalden monitöre eşleme
+        self._frame_item = None  # kalıcı tuval görüntü öğesi
+        self._frame_pos = (0, 0)
+        self._src_rect = None
+        self._scratch: Optional[ImageTk.PhotoImage] = None   # kısmi kopya için ara görüntü
+        self._pil_img: Optional[Image.Image] = None   # tam paste için kalıcı PIL görüntüsü
+        self._roi_start = None
+
+        # STATUS
+        self.status_var = tk.StringVar(value="Hazır")
+        ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor="w")\
+            .pack(side=tk.BOTTOM, fill=tk.X)
+
+        # çalışırken yapılan değişiklikler bir sonraki karede geçerli olur
+        self._config_id = None
+        for var in (self.monitor_var, self.scale_var, self.fps_var, self.adaptive_fps_var,
+                    self.cursor_var, self.debug_var, self.arrow_len_var, self.arrow_dir_var,
+                    self.anchor_mode_var, self.arrow_offset_var, self.arrow_color_hex,
+                    self.resize_mode_var, self.pipeline_var, self.grid_var,
+                    self.grid_monitors_var, self.click_var, self.trail_var):
+            var.trace_add("write", self.on_setting_changed)
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self._enum_thread: Optional[threading.Thread] = None
+        self._enum_result = None
+        self.set_status("Başlatılıyor...")
+        self.refresh_monitors()
+
+    # ---- GUI event handlers ----
+    def pick_color(self):
+        color = colorchooser.askcolor(color=self.arrow_color_hex.get(), title="Ok Rengini Seç")
+        if color and color[1]:
+            self.arrow_color_hex.set(color[1])
+            self.color_preview.configure(bg=color[1])
+
+    def new_source(self, backend: Optional[str] = None) -> CaptureSource:
+        backend = backend or self.backend_var.get()
+        return make_capture_source(backend, **self.backend_opts.get(backend, {}))
+
+    def refresh_monitors(self):
+        """Ağır modülleri yükle ve monitörleri arka planda listele; arayüz beklemez."""
+        if self._enum_thread is not None and self._enum_thread.is_alive():
+            return
+        backend = self.backend_var.get()   # Tk değişkenleri yalnızca bu thread'de okunur
+
+        def work():
+            try:
+                load_dependencies()
+                GEOMETRY.refresh()
+                self._enum_result = self.new_source(backend).monitors()
+            except Exception as e:
+                self._enum_result = e
+        self._enum_result = None
+        self._enum_thread = threading.Thread(target=work, name="monitor-enum", daemon=True)
+        self._enum_thread.start()
+        self.root.after(20, self._poll_monitors)
+
+    def _poll_monitors(self):
+        if self._enum_thread.is_alive():
+            self.root.after(20, self._poll_monitors)
+            return
+        result = self._enum_result
+        if isinstance(result, Exception):
+            self.set_status("Monitörler alınamadı.")
+            messagebox.showerror("Hata", f"Monitörler alınamadı: {result}")
+            return
+        # seçim hâlâ geçerliyse korunur (çalışan önizleme başka monitöre geçmesin)
+        current = parse_monitor_index(self.monitor_var.get()) if self.monitors else None
+        self.monitors = result
+        self.monitor_opts = monitors_to_options(self.monitors)
+        self.monitor_combo["values"] = self.monitor_opts
+        if current is None or not 0 <= current < len(self.monitor_opts):
+            current = 1 if len(self.monitor_opts) > 1 else 0
+        self.monitor_var.set(self.monitor_opts[current])
+        if not self.is_running:
+            self.start_btn.config(state=tk.NORMAL)
+        self.set_status("Monitör listesi hazır.")
+
+    def on_topmost(self):
+        set_window_topmost(self.root, self.topmost_var.get())
+
+    def read_config(self) -> PreviewConfig:
+        """Arayüzdeki değerlerden ayar anlık görüntüsü (geçersizse ValueError)."""
+        scale = float(self.scale_var.get())
+        if not (0.1 <= scale <= 1.5):
+            raise ValueError("Ölçek 0.1–1.5 arası olmalı.")
+        monitor_indices = parse_monitor_list(self.grid_monitors_var.get()) \
+            if self.grid_var.get() else None
+        if monitor_indices is not None and not monitor_indices:
+            raise ValueError("Izgara için en az bir monitör girin (örn. 1,2).")
+        monitor_idx = parse_monitor_index(self.monitor_var.get())
+        # worker geçersiz index'te durur; değişiklik burada reddedilir
+        bad = [i for i in (monitor_indices or [monitor_idx])
+               if not 0 <= i < len(self.monitors)]
+        if bad:
+            raise ValueError(f"Geçersiz monitör: {', '.join(map(str, bad))} "
+                             f"(0–{len(self.monitors) - 1} arası olmalı).")
+        roi_mode, roi, roi_size = self.read_roi()
+        return PreviewConfig(
+            monitor_idx=monitor_idx,
+            scale=scale, fps=int(self.fps_var.get()),
+            show_cursor=bool(self.cursor_var.get()),
+            debug=bool(self.debug_var.get()),
+            arrow_len=int(self.arrow_len_var.get()),
+            arrow_dir=self.arrow_dir_var.get(),
+            anchor_mode=self.anchor_mode_var.get(),
+            arrow_offset=int(self.arrow_offset_var.get()),
+            arrow_color_bgr=hex_to_bgr(self.arrow_color_hex.get()),
+            resize_mode=self.resize_mode_var.get(),
+            # cv2/numpy GIL'i bıraktığı için işleme birkaç thread'e yayılabilir
+            pipeline_workers=max(2, min(4, (os.cpu_count() or 2) - 1))
+                if self.pipeline_var.get() else 0,
+            monitor_indices=tuple(monitor_indices) if monitor_indices else None,
+            adaptive_fps=bool(self.adaptive_fps_var.get()),
+            roi_mode=roi_mode, roi=roi, roi_size=roi_size,
+            click_highlight=bool(self.click_var.get()),
+            cursor_trail=bool(self.trail_var.get()))
+
+    def on_setting_changed(self, *_args):
+        # aynı olay döngüsündeki değişiklikleri tek güncellemede topla
+        if self._config_id is None:
+            self._config_id = self.root.after_idle(self.apply_config)
+
+    def apply_config(self):
+        """Çalışan worker'a güncel ayarları ver (yeniden başlatmadan)."""
+        self._config_id = None
+        worker = self.worker
+        if worker is None or not self.is_running:
+            return
+        try:
+            cfg = self.read_config()
+        except (ValueError, tk.TclError):
+            return  # yazım sürerken geçersiz değer: son geçerli ayar kalır
+        if cfg == worker.config:
+            return
+        worker.configure(cfg)
+        self._poll_ms = max(1, int(500 / max(1, cfg.fps)))
+        self.set_status("Ayarlar uygulandı.")
+
+    def start_preview(self):
+        if self.is_running or not self.monitors:
+            return
+        try:
+            cfg = self.read_config()
+            profile = bool(self.profile_var.get())
+            # debug açıkken worker profilciyi kendisi açar, kapanınca geri kapatır
+            self.profiler = PipelineProfiler(
+                enabled=profile, trace=profile,
+                track_alloc=profile and bool(self.profile_alloc_var.get()))
+            if self.process_var.get():
+                # yakalama + işleme alt süreçte; çökerse yeniden başlatılır
+                backend = self.backend_var.get()
+                self.worker = ProcessCaptureWorker(self, backend, self.backend_opts.get(backend, {}),
+                                                   config=cfg, profiler=self.profiler)
+            else:
+                self.worker = PreviewWorker(self, source=self.new_source(),
+                                            profiler=self.profiler, **cfg.as_dict())
+            if self.record_path and self.recorder is None:
+                path, self.record_path = self.record_path, None
+                self.start_recording(path, "video" if os.path.splitext(path)[1] else "resim")
+            self.worker.recorder = self.recorder
+            self.worker.streamer = self.streamer
+            self.worker.start()
+            self.is_running = True
+            self._status_ts = time.perf_counter()
+            self._poll_ms = max(1, int(500 / max(1, cfg.fps)))  # FPS'in iki katı sıklıkla yokla
+            self._poll_id = self.root.after(self._poll_ms, self.poll_frames)
+            self.start_btn.config(state=tk.DISABLED)
+            self.stop_btn.config(state=tk.NORMAL)
+            mon_text = ",".join(map(str, cfg.monitors()))
+            note = " Ardışık düzen ızgara/ROI ile kullanılamaz; tek thread çalışıyor." \
+                if cfg.pipeline_workers and not cfg.pipelined() else ""
+            self.set_status(f"Önizleme başladı (Monitör {mon_text}, ölçek {cfg.scale}, "
+                            f"{cfg.fps} FPS).{note}")
+        except Exception as e:
+            messagebox.showerror("Başlatma Hatası", str(e))
+
+    def stop_preview(self):
+        if self.worker:
+            self.worker.stop()
+            self.worker.mailbox.clear()
+        self.stop_recording()
+        if self.profiler is not None:
+            self.profiler.close()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.is_running = False
+        self.start_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
+        self.set_status("Önizleme durduruldu.")
+
+    def on_canvas_configure(self, event):
+        self.canvas_size = (event.width, event.height)
+        self._place_frame()
+
+    def poll_frames(self):
+        """Tk thread'i: teslim kutusundaki en yeni kareyi al ve göster."""
+        self._poll_id = None
+        worker = self.worker
+        if worker is None or not self.is_running:
+            return
+        frame = worker.mailbox.take()
+        if frame is not None:
+            self.update_frame(frame)
+            worker.mailbox.presented += 1
+        if worker.debug and worker.status_text:
+            self.set_status(worker.status_text)
+        elif time.perf_counter() - self._status_ts >= 1.0:
+            self._status_ts = time.perf_counter()
+            text = f"{worker.scheduler.summary()} | {worker.mailbox.counters()}"
+            if self.recorder is not None:
+                text += f" | {self.recorder.counters()}"
+            if self.streamer is not None:
+                text += f" | {self.streamer.counters()}"
+            self.set_status(text)
+            if worker.profiler.trace:
+                self.draw_profile_overlay(worker)
+        if not worker.is_alive():
+            self.on_worker_stopped(worker.error or "")
+            return
+        self._poll_id = self.root.after(self._poll_ms, self.poll_frames)
+
+    def update_frame(self, frame: Frame):
+        """Kareyi kalıcı PhotoImage'a yaz; tuval öğesi bir kez oluşturulur.
+
+        Boyut aynı kaldıkça öğe ve PhotoImage yeniden kullanılır; kirli
+        alanlar azsa yalnızca onlar kopyalanır, konum yalnızca boyut ya da
+        tuval değişince hesaplanır.
+        """
+        t0 = time.perf_counter()
+        h, w = frame.rgb.shape[:2]
+        photo = self.photo_ref
+        if photo is None or (photo.width(), photo.height()) != (w, h):
+            # yalnızca boyut değişince yeni PhotoImage (GC koruması: photo_ref)
+            self._pil_img = frame.to_image(Image.new("RGB", (w, h)))
+            photo = self.photo_ref = ImageTk.PhotoImage(self._pil_img)
+            self._scratch = None
+            if self._frame_item is None:
+                self._frame_item = self.canvas.create_image(0, 0, anchor="nw", image=photo,
+                                                            tags="frame")
+                self.canvas.tag_lower(self._frame_item)   # seçim/profil katmanları üstte kalır
+            else:
+                self.canvas.itemconfigure(self._frame_item, image=photo)
+            self._place_frame()
+        elif not self._paste_dirty(photo, frame):
+            photo.paste(frame.to_image(self._pil_img))
+        if frame.src_rect != self._src_rect:
+            self._src_rect = frame.src_rect
+            self._update_view()
+        frame.release()
+        if self.worker:
+            self.worker.profiler.add("present", time.perf_counter() - t0)
+
+    def _paste_dirty(self, photo: ImageTk.PhotoImage, frame: Frame) -> bool:
+        """Kirli dikdörtgenleri yardımcı PhotoImage üzerinden yerinde kopyala.
+
+        Kısmi çizim kapalıysa, kare tam güncelleme istiyorsa ya da kirli
+        alan büyükse False döner (tam paste daha ucuz).
+        """
+        if frame.dirty is None or not self.partial_var.get():
+            return False
+        h, w = frame.rgb.shape[:2]
+        rects = []
+        area = 0
+        for x0, y0, x1, y1 in frame.dirty:
+            x0, y0, x1, y1 = max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+            if x1 > x0 and y1 > y0:
+                rects.append((x0, y0, x1, y1))
+                area += (x1 - x0) * (y1 - y0)
+        if len(rects) > PARTIAL_MAX_RECTS or area > PARTIAL_MAX_AREA * w * h:
+            return False
+        scratch = self._scratch
+        if scratch is None:
+            scratch = self._scratch = ImageTk.PhotoImage("RGB", (w, h))
+        for x0, y0, x1, y1 in rects:
+            sub = np.ascontiguousarray(frame.rgb[y0:y1, x0:x1])
+            scratch.paste(Image.frombuffer("RGB", (x1 - x0, y1 - y0), sub, "raw", "RGB", 0, 1))
+            self.canvas.tk.call(str(photo), "copy", str(scratch),
+                                "-from", 0, 0, x1 - x0, y1 - y0, "-to", x0, y0)
+        return True
+
+    def _place_frame(self):
+        """Kareyi tuvalde ortala (yalnızca boyut/tuval değişince çağrılır)."""
+        photo = self.photo_ref
+        if photo is None or self._frame_item is None:
+            return
+        cw, ch = self.canvas_size
+        img_w, img_h = photo.width(), photo.height()
+        x = (cw - img_w) // 2 if cw > img_w else 0
+        y = (ch - img_h) // 2 if ch > img_h else 0
+        self.canvas.coords(self._frame_item, x, y)
+        self._frame_pos = (x, y)
+        self._update_view()
+
+    def _update_view(self):
+        photo = self.photo_ref
+        if photo is not None:
+            x, y = self._frame_pos
+            self._view = (x, y, photo.width(), photo.height(), self._src_rect)
+
+    # ---- kayıt ----
+    def toggle_record(self):
+        if self.recorder is not None:
+            self.stop_recording()
+            return
+        fmt = self.record_fmt_var.get()
+        if fmt == "video":
+            path = filedialog.asksaveasfilename(
+                title="Kaydı Kaydet", defaultextension=".mp4",
+                filetypes=[("MP4", "*.mp4"), ("AVI (MJPG)", "*.avi")])
+        else:
+            path = filedialog.askdirectory(title="Kareler için klasör seç")
+        if path:
+            self.start_recording(path, fmt)
+
+    def start_recording(self, path: str, fmt: str):
+        try:
+            codec = "MJPG" if path.lower().endswith(".avi") else "mp4v"
+            rec = FrameRecorder(path, int(self.fps_var.get()), fmt=fmt, codec=codec,
+                                drop_policy=self.drop_policy_var.get())
+        except Exception as e:
+            messagebox.showerror("Kayıt Hatası", str(e))
+            return
+        rec.start()
+        self.recorder = rec
+        if self.worker:
+            self.worker.recorder = rec
+        self.record_btn.config(text="Kaydı Durdur")
+        self.set_status(f"Kayıt başladı: {path}")
+
+    def stop_recording(self):
+        rec, self.recorder = self.recorder, None
+        if rec is None:
+            return
+        if self.worker:
+            self.worker.recorder = None
+        rec.close(timeout=5.0)   # kuyrukta kalan birkaç kare yazılır
+        self.record_btn.config(text="Kaydı Başlat")
+        self.set_status(f"Kayıt bitti: {rec.path} ({rec.counters()})")
+
+    # ---- ağ yayını ----
+    def toggle_stream(self):
+        if self.streamer is not None:
+            self.stop_stream()
+        else:
+            self.start_stream()
+
+    def start_stream(self):
+        try:
+            host, port = parse_host_port(self.stream_addr_var.get())
+            srv = PreviewStreamServer(host, port, client_fps=self.stream_fps)
+            srv.start()
+        except Exception as e:
+            messagebox.showerror("Yayın Hatası", f"Sunucu başlatılamadı: {e}")
+            return
+        self.streamer = srv
+        if self.worker:
+            self.worker.streamer = srv
+        self.stream_btn.config(text="Yayını Durdur")
+        self.stream_url_var.set(srv.url)
+        self.set_status(f"Yayın açık: {srv.url} (MJPEG: stream.mjpg, WebSocket: ws)")
+
+    def stop_stream(self):
+        srv, self.streamer = self.streamer, None
+        if srv is None:
+            return
+        if self.worker:
+            self.worker.streamer = None
+        srv.close()
+        self.stream_btn.config(text="Yayını Başlat")
+        self.stream_url_var.set("")
+        self.set_status("Yayın kapatıldı.")
+
+    # ---- ROI seçimi ----
+    def read_roi(self) -> Tuple[str, Tuple[int,int,int,int], Tuple[int,int]]:
+        return (self.roi_mode_var.get(), parse_rect(self.roi_rect_var.get()),
+                parse_size(self.roi_size_var.get()))
+
+    def apply_roi(self):
+        """ROI ayarlarını doğrula ve çalışan worker'a aktar (yeniden başlatmadan)."""
+        try:
+            self.read_roi()
+        except Exception:
+            messagebox.showerror("Hata", "Bölge biçimi: x,y,w,h ve WxH olmalı.")
+            return
+        self.apply_config()
+
+    def on_roi_press(self, event):
+        if not self.is_running or self._view is None or self._view[4] is None:
+            return
+        self._roi_start = (event.x, event.y)
+        self.canvas.delete("roi_sel")
+        self.canvas.create_rectangle(event.x, event.y, event.x, event.y, tags="roi_sel",
+                                     outline="#FFD400", dash=(4, 2))
+
+    def on_roi_drag(self, event):
+        if self._roi_start is not None:
+            self.canvas.coords("roi_sel", *self._roi_start, event.x, event.y)
+
+    def on_roi_release(self, event):
+        start, self._roi_start = self._roi_start, None
+        self.canvas.delete("roi_sel")
+        if start is None or self._view is None or self._view[4] is None:
+            return
+        ox, oy, img_w, img_h, (sx, sy, sw, sh) = self._view
+        # tuval -> gösterilen görüntü -> monitör koordinatları
+        x0, x1 = sorted((start[0], event.x))
+        y0, y1 = sorted((start[1], event.y))
+        x0, x1 = max(0, x0 - ox), min(img_w, x1 - ox)
+        y0, y1 = max(0, y0 - oy), min(img_h, y1 - oy)
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return  # tıklama ya da çok küçük seçim
+        fx, fy = sw / img_w, sh / img_h
+        rect = (sx + int(x0 * fx), sy + int(y0 * fy),
+                int((x1 - x0) * fx), int((y1 - y0) * fy))
+        self.roi_rect_var.set(",".join(map(str, rect)))
+        self.roi_mode_var.set("sabit")
+        self.apply_roi()
+        self.set_status(f"Bölge: {rect[2]}x{rect[3]} @({rect[0]},{rect[1]})")
+
+    def draw_profile_overlay(self, worker: PreviewWorker):
+        """Profil açıkken tuvalin sol üstünde aşama tablosu."""
+        text = (f"{worker.profiler.report()}\n{worker.scheduler.summary()}\n"
+                f"{worker.mailbox.counters()}")
+        items = self.canvas.find_withtag("prof")
+        if items:
+            self.canvas.itemconfigure(items[0], text=text)
+        else:
+            self.canvas.create_text(8, 8, anchor="nw", text=text, tags="prof",
+                                    fill="#FFD400", font=("Consolas", 9))
+        self.canvas.tag_raise("prof")
+
+    def export_trace(self, path: Optional[str] = None):
+        prof = self.profiler
+        if prof is None or not prof.trace:
+            messagebox.showinfo("İz", "Önce 'Profil' açıkken önizlemeyi çalıştırın.")
+            return
+        if path is None:
+            path = filedialog.asksaveasfilename(
+                title="İzi Kaydet", defaultextension=".json",
+                filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+            if not path:
+                return
+        extra = {}
+        if self.worker:
+            extra = {"scheduler": self.worker.scheduler.summary(),
+                     "presented": self.worker.mailbox.presented,
+                     "dropped": self.worker.mailbox.dropped,
+                     "capture_dropped": self.worker.mailbox.capture_dropped}
+        try:
+            prof.export(path, extra)
+            self.set_status(f"İz kaydedildi: {path}")
+        except Exception as e:
+            messagebox.showerror("Hata", f"İz yazılamadı: {e}")
+
+    def on_worker_stopped(self, reason: str):
+        self.stop_preview()
+        if reason:
+            self.set_status(f"Önizleme sonlandı: {reason}")
+
+    def set_status(self, text: str):
+        self.status_var.set(text)
+
+    def on_close(self):
+        try:
+            if self.worker:
+                self.worker.stop()
+        except Exception:
+            pass
+        if self.profiler is not None:
+            self.profiler.close()
+            if self.trace_path and self.profiler.trace:
+                self.export_trace(self.trace_path)
+        self.stop_recording()
+        self.stop_stream()
+        self.root.destroy()
+
+# --- main ---------------------------------------------------------------------
+def parse_args(argv: Optional[List[str]] = None):
+    import argparse
+    ap = argparse.ArgumentParser(description=APP_TITLE)
+    ap.add_argument("--backend", choices=list(CAPTURE_BACKENDS), default="mss",
+                    help="yakalama kaynağı (synthetic: ekransız test/ölçüm)")
+    ap.add_argument("--synthetic-size", action="append", type=parse_size, metavar="WxH",
+                    help="sentetik monitör boyutu; birden çok verilirse yan yana dizilir")
+    ap.add_argument("--synthetic-frames", nargs="+", metavar="IMG",
+                    help="sentetik kaynakta sırayla oynatılacak kayıtlı kareler")
+    ap.add_argument("--profile", action="store_true",
+                    help="aşama süreleri ve sayaçlar")
+    ap.add_argument("--profile-alloc", action="store_true",
+                    help="profile kare başına bellek ölçümünü ekle (tracemalloc; yavaşlatır)")
+    ap.add_argument("--trace", metavar="PATH",
+                    help="kapanışta profil izini yaz (.json ya da .csv); --profile gerektirir")
+    ap.add_argument("--record", metavar="PATH",
+                    help="önizleme başlayınca kaydet: .mp4/.avi video, uzantısızsa resim klasörü")
+    ap.add_argument("--record-drop", choices=DROP_POLICIES, default="eskiyi at",
+                    help="kayıt kuyruğu dolunca hangi kare atılsın")
+    ap.add_argument("--serve", metavar="[HOST:]PORT",
+                    help="önizlemeyi yayınla (MJPEG /stream.mjpg, WebSocket /ws); yalnızca PORT "
+                         "bu makineye açar, ağ için HOST açıkça verilmeli (ör. 0.0.0.0:8765)")
+    ap.add_argument("--stream-fps", type=int, default=15,
+                    help="istemci başına varsayılan FPS (istemci ?fps= ile değiştirebilir)")
+    ap.add_argument("--process", action="store_true",
+                    help="yakalama ve işlemeyi ayrı süreçte çalıştır (paylaşımlı bellek)")
+    ap.add_argument("--startup-probe", metavar="PATH", help=argparse.SUPPRESS)
+    return ap.parse_args(argv)
+
+def startup_probe(root: tk.Tk, app: App, path: str):
+    """startup_timing.py için: pencerenin göründüğü ve monitörlerin hazır olduğu
+    anları (time.time()) JSON'a yazıp uygulamayı kapatır."""
+    marks = {"main": time.time()}
+    root.bind("<Map>", lambda _e: marks.setdefault("window", time.time()), add="+")
+
+    def check():
+        if app.monitors and "window" in marks:
+            marks["ready"] = time.time()
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(marks, f)
+            app.on_close()
+        else:
+            root.after(5, check)
+    root.after(5, check)
+
+def main():
+    args = parse_args()
+    make_process_dpi_aware()
+    root = tk.Tk()
+    try:
+        from tkinter import font as tkfont
+        tkfont.nametofont("TkDefaultFont").configure(size=10)
+    except Exception:
+        pass
+    synthetic_opts: Dict = {}
+    if args.synthetic_size:
+        synthetic_opts["sizes"] = args.synthetic_size
+    if args.synthetic_frames:
+        synthetic_opts["frames"] = SyntheticCapture.load_frames(args.synthetic_frames)
+    app = App(root, backend=args.backend, backend_opts={"synthetic": synthetic_opts},
+              profile=args.profile or args.profile_alloc or bool(args.trace), trace_path=args.trace,
+              record_path=args.record, drop_policy=args.record_drop,
+              serve=args.serve, stream_fps=args.stream_fps, process=args.process,
+              profile_alloc=args.profile_alloc)
+    if args.serve:
+        app.start_stream()
+    if args.startup_probe:
+        startup_probe(root, app, args.startup_probe)
+    root.mainloop()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()   # PyInstaller exe'de alt süreç girişi
+    main()
@@ -0,0 +1,105 @@
+# startup_timing.py  —  açılış süresinin ölçümü
+#
+# Modül içe aktarma süresini ekransız ölçer; ekran varsa uygulamayı (ya da
+# paketlenmiş exe'yi) gizli --startup-probe ile açıp pencerenin görünme ve
+# monitör listesinin hazır olma sürelerini de ölçer. Hedef aşılırsa çıkış 1.
+#
+#   python startup_timing.py                        # içe aktarma + pencere
+#   python startup_timing.py --importtime           # en yavaş içe aktarmalar
+#   python startup_timing.py --exe dist/MonitorPreview.exe --target-window 1.5
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODULE = "monitor_preview_tk"
+
+def measure_import(runs: int) -> float:
+    """Temiz bir yorumlayıcıda modülün içe aktarılma süresi (saniye, medyan)."""
+    code = ("import time; t = time.perf_counter(); import " + MODULE +
+            "; print(time.perf_counter() - t)")
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True,
+                             capture_output=True, text=True).stdout
+        samples.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def import_offenders(top: int):
+    """-X importtime çıktısından kümülatif olarak en pahalı modüller."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + MODULE],
+                         cwd=HERE, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cum_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def has_display() -> bool:
+    return sys.platform == "win32" or bool(os.environ.get("DISPLAY"))
+
+def measure_window(exe: str, runs: int, timeout: float):
+    """Pencerenin görünmesi ve monitörlerin hazır olması (saniye, medyan)."""
+    cmd = [exe] if exe else [sys.executable, os.path.join(HERE, MODULE + ".py")]
+    window, ready = [], []
+    for _ in range(runs):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(path)
+        t0 = time.time()
+        proc = subprocess.Popen(cmd + ["--startup-probe", path], cwd=HERE)
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise RuntimeError(f"uygulama {timeout:.0f} sn içinde hazır olmadı")
+        with open(path, encoding="utf-8") as f:
+            marks = json.load(f)
+        os.remove(path)
+        window.append(marks["window"] - t0)
+        ready.append(marks["ready"] - t0)
+    return statistics.median(window), statistics.median(ready)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Açılış süresi ölçümü")
+    ap.add_argument("--runs", type=int, default=5, help="ölçüm tekrarı (medyan alınır)")
+    ap.add_argument("--importtime", action="store_true",
+                    help="en pahalı içe aktarmaları listele")
+    ap.add_argument("--exe", metavar="PATH", help="paketlenmiş uygulama (varsayılan: kaynak)")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--target-import", type=float, default=0.25, metavar="SN")
+    ap.add_argument("--target-window", type=float, default=1.0, metavar="SN")
+    ap.add_argument("--target-ready", type=float, default=2.0, metavar="SN")
+    args = ap.parse_args(argv)
+
+    failed = False
+
+    def report(label: str, value: float, target: float):
+        nonlocal failed
+        ok = value <= target
+        failed |= not ok
+        print(f"{label:<22} {value * 1000:>8.0f} ms  (hedef {target * 1000:.0f} ms) "
+              f"{'OK' if ok else 'AŞILDI'}")
+
+    if not args.exe:
+        report("modül içe aktarma", measure_import(args.runs), args.target_import)
+        if args.importtime:
+            for cum_us, name in import_offenders(15):
+                print(f"  {cum_us / 1000:>8.1f} ms  {name}")
+    if has_display():
+        window, ready = measure_window(args.exe, args.runs, args.timeout)
+        report("pencere görünür", window, args.target_window)
+        report("monitörler hazır", ready, args.target_ready)
+    else:
+        print("ekran yok: pencere süreleri ölçülmedi")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Kare başına bellek ayırma: sıcak yol kare boyutunda tampon ayırmamalı."""
+import time
+
+import numpy as np
+import pytest
+
+import monitor_preview_tk as m
+
+m.load_dependencies()
+
+SIZE = (1920, 1080)
+FRAME_BYTES = SIZE[0] * SIZE[1] * 4
+
+
+class HeadlessView:
+    canvas_size = (0, 0)
+
+
+def _run(motion, frames=80, timeout=20.0):
+    profiler = m.PipelineProfiler(enabled=True, track_alloc=True)
+    config = m.PreviewConfig(monitor_idx=1, scale=0.5, fps=1000, show_cursor=True)
+    worker = m.PreviewWorker(HeadlessView(), source=m.SyntheticCapture(sizes=[SIZE], motion=motion),
+                             profiler=profiler, **config.as_dict())
+    worker.start()
+    t_end = time.perf_counter() + timeout
+    try:
+        while len(profiler.allocs) < frames and time.perf_counter() < t_end:
+            f = worker.mailbox.take()
+            if f is not None:
+                f.release()
+            time.sleep(0.0005)
+    finally:
+        worker.stop()
+        worker.join(timeout=5)
+        profiler.close()
+    assert worker.error is None
+    allocs = list(profiler.allocs)[10:]   # ilk kareler tamponları ayırır
+    assert len(allocs) >= 20
+    return allocs
+
+
+@pytest.mark.parametrize("motion", ["box", "full"])
+def test_worker_traced_bytes_per_frame_bounded(motion):
+    allocs = _run(motion)
+    # yalnızca küçük geçici nesneler (imleç sprite alanı, sözlükler); tam kare değil
+    assert m.percentile(allocs, 50) < 32 * 1024
+    assert m.percentile(allocs, 90) < FRAME_BYTES // 50
+
+
+def test_to_image_fills_persistent_image_in_place():
+    rgb = np.zeros((SIZE[1] // 2, SIZE[0] // 2, 3), dtype=np.uint8)
+    frame = m.Frame(rgb, 1, 0.0)
+    into = m.Image.new("RGB", (rgb.shape[1], rgb.shape[0]))
+    rgb[5, 7] = (10, 20, 30)
+    assert frame.to_image(into) is into
+    assert into.getpixel((7, 5)) == (10, 20, 30)
+    rgb[5, 7] = (40, 50, 60)
+    frame.to_image(into)
+    assert into.getpixel((7, 5)) == (40, 50, 60)
@@ -0,0 +1,47 @@
+"""Paylaşımlı bellek halkası: kare ve meta verisi (kirli alanlar, src_rect) taşınır."""
+import numpy as np
+
+import monitor_preview_tk as m
+
+m.load_dependencies()
+
+
+def _ring():
+    return m.SharedFrameRing(slots=3, slot_bytes=64 * 48 * 3, create=True)
+
+
+def test_ring_round_trip_carries_dirty_and_src_rect():
+    ring = _ring()
+    try:
+        pool = m.FrameBufferPool()
+        rgb = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+        assert ring.write(rgb, 7, 1.5, [(1, 2, 3, 4)], (100, 200, 640, 360))
+        out, seq, ts, dirty, src_rect, n = ring.read_latest(0, pool)
+        assert np.array_equal(out, rgb)
+        assert (seq, ts, n) == (7, 1.5, 1)
+        assert dirty == [(1, 2, 3, 4)]
+        assert src_rect == (100, 200, 640, 360)
+        # ızgara karesi: src_rect yok; araya kaçırılan kare girdiyse dirty bilinmez
+        ring.write(rgb, 8, 2.0, [], None)
+        ring.write(rgb, 9, 2.5, [(0, 0, 1, 1)], None)
+        _, seq, _, dirty, src_rect, n = ring.read_latest(n, pool)
+        assert (seq, dirty, src_rect, n) == (9, None, None, 3)
+        assert ring.read_latest(n, pool) is None
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def test_profiler_merges_remote_rows():
+    child = m.PipelineProfiler(enabled=True, trace=True)
+    for seq in (1, 2):
+        child.frame_begin()
+        child.add("grab", 0.002)
+        child.frame_end(seq, float(seq))
+    rows = child.take_rows()
+    assert [r["seq"] for r in rows] == [1, 2] and not child.rows
+    parent = m.PipelineProfiler(enabled=True, trace=True)
+    parent.merge(rows)
+    assert [r["seq"] for r in parent.rows] == [1, 2]
+    assert parent.counters["frames"] == 2
+    assert parent.stats()["stages"]["grab"]["n"] == 2
@@ -0,0 +1,54 @@
+"""Profilcinin açılıp kapanması ve bellek ölçümünün kapsamı."""
+import time
+
+import monitor_preview_tk as m
+
+m.load_dependencies()
+
+
+class HeadlessView:
+    canvas_size = (0, 0)
+
+
+def _wait_applied(worker, cfg, timeout=5.0):
+    worker.configure(cfg)
+    t_end = time.perf_counter() + timeout
+    while worker._applied is not cfg and time.perf_counter() < t_end:
+        time.sleep(0.005)
+    assert worker._applied is cfg
+
+
+def test_debug_toggle_restores_profiler_state():
+    cfg = m.PreviewConfig(monitor_idx=1, scale=0.5, fps=60)
+    worker = m.PreviewWorker(HeadlessView(), source=m.SyntheticCapture(), **cfg.as_dict())
+    assert not worker.profiler.enabled
+    worker.start()
+    try:
+        _wait_applied(worker, m.PreviewConfig(**dict(cfg.as_dict(), debug=True)))
+        assert worker.profiler.enabled
+        _wait_applied(worker, m.PreviewConfig(**dict(cfg.as_dict(), debug=False)))
+        assert not worker.profiler.enabled
+    finally:
+        worker.stop()
+        worker.join(timeout=5)
+
+
+def test_alloc_not_measured_with_concurrent_frames():
+    profiler = m.PipelineProfiler(enabled=True, track_alloc=True)
+    cfg = m.PreviewConfig(monitor_idx=1, scale=0.5, fps=1000, pipeline_workers=2)
+    worker = m.PreviewWorker(HeadlessView(), source=m.SyntheticCapture(motion="full"),
+                             profiler=profiler, **cfg.as_dict())
+    worker.start()
+    t_end = time.perf_counter() + 5.0
+    try:
+        while profiler.counters.get("frames", 0) < 10 and time.perf_counter() < t_end:
+            f = worker.mailbox.take()
+            if f is not None:
+                f.release()
+            time.sleep(0.001)
+    finally:
+        worker.stop()
+        worker.join(timeout=5)
+        profiler.close()
+    assert profiler.counters.get("frames", 0) >= 10
+    assert profiler.alloc_paused and not profiler.allocs
@@ -0,0 +1,186 @@
+"""Küçültme ön ayarlarının doğruluğu, kısmi güncelleme eşliği ve otomatik seçim.
+
+Ön ayarlar, uygulamadan bağımsız bir başvuruya göre sınanır: kaynak
+piksellerin hedef pikselin kapladığı alanla ağırlıklı ortalaması (float
+kutu filtresi). Her ön ayarın bu başvurudan izin verilen sapması ayrıdır.
+"""
+import numpy as np
+import pytest
+
+import monitor_preview_tk as m
+
+m.load_dependencies()
+cv2 = m.cv2
+
+
+def _box_axis(a, size, axis):
+    # sabit değerli pikseller üzerinde kümülatif toplam: [t0, t1) alanının integrali
+    n = a.shape[axis]
+    a = np.moveaxis(a, axis, 0)
+    c = np.concatenate([np.zeros((1,) + a.shape[1:]), np.cumsum(a, axis=0)])
+    t = np.arange(size + 1) * (n / size)
+    i = np.minimum(np.floor(t).astype(int), n - 1)
+    frac = (t - i)[(slice(None),) + (None,) * (a.ndim - 1)]
+    f = c[i] + frac * (c[i + 1] - c[i])
+    return np.moveaxis((f[1:] - f[:-1]) / (n / size), 0, axis)
+
+
+def box_reference(src, w, h):
+    """Float kutu filtresiyle küçültme (alan ağırlıklı ortalama)."""
+    return _box_axis(_box_axis(src.astype(np.float64), h, 0), w, 1)
+
+
+def _smooth(w, h):
+    y, x = np.mgrid[0:h, 0:w].astype(np.float64)
+    img = np.empty((h, w, 4), dtype=np.uint8)
+    img[..., 0] = 127 + 100 * np.sin(x / 37.0) * np.cos(y / 53.0)
+    img[..., 1] = 127 + 120 * np.sin((x + y) / 91.0)
+    img[..., 2] = x * 255 / w
+    img[..., 3] = 255
+    return img
+
+
+def _stripes(w, h):
+    """1 piksellik siyah/beyaz dikey çizgiler: örtüşmeye (aliasing) en duyarlı desen."""
+    img = np.zeros((h, w, 4), dtype=np.uint8)
+    img[:, ::2, :3] = 255
+    img[..., 3] = 255
+    return img
+
+
+def _noise(w, h, seed=0):
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+    img[..., 3] = 255
+    return img
+
+
+def _resize(src, w, h, preset):
+    dst = np.empty((h, w, 4), dtype=np.uint8)
+    m.resize_bgra(src, dst, preset)
+    return dst
+
+
+def _error(out, ref):
+    e = np.abs(out[..., :3].astype(np.float64) - ref[..., :3])
+    return e.max(), e.mean()
+
+
+# (ön ayar, boyut) -> (en büyük, ortalama) mutlak sapma, düzgün içerikte
+SMOOTH_BOUNDS = {
+    "hızlı": {(960, 540): (4, 1.5), (1000, 562): (8, 2.0)},
+    "dengeli": {(960, 540): (1, 0.5), (1000, 562): (1, 0.5)},
+    "yüksek kalite": {(960, 540): (3, 0.5), (1000, 562): (3, 0.5)},
+}
+
+
+@pytest.mark.parametrize("preset", m.RESIZE_PRESETS)
+@pytest.mark.parametrize("size", [(960, 540), (1000, 562)])
+def test_preset_close_to_box_reference(preset, size):
+    src = _smooth(1920, 1080)
+    max_err, mean_err = _error(_resize(src, *size, preset), box_reference(src, *size))
+    bound_max, bound_mean = SMOOTH_BOUNDS[preset][size]
+    assert max_err <= bound_max and mean_err <= bound_mean
+
+
+@pytest.mark.parametrize("size", [(960, 540), (1000, 562), (480, 270)])
+def test_balanced_is_area_average_on_any_content(size):
+    for src in (_noise(1920, 1080), _stripes(1920, 1080)):
+        max_err, _ = _error(_resize(src, *size, "dengeli"), box_reference(src, *size))
+        assert max_err <= 1
+
+
+def test_quality_does_not_alias_fine_stripes():
+    # tam sayı olmayan oranda 1 piksellik çizgiler düz griye inmeli; cv2 LANCZOS4
+    # küçültmede çekirdeği genişletmediği için bunları kalın bantlara çevirir
+    src = _stripes(1920, 1080)
+    ref = box_reference(src, 1000, 562)
+    out = _resize(src, 1000, 562, "yüksek kalite")
+    _, mean_err = _error(out, ref)
+    assert mean_err <= 8 and out[..., :3].std() <= 5
+    _, cv2_err = _error(cv2.resize(src, (1000, 562), interpolation=cv2.INTER_LANCZOS4), ref)
+    assert cv2_err > 30
+
+
+@pytest.mark.parametrize("k", [2, 3, 4])
+def test_fast_samples_block_centre(k):
+    src = _noise(480 * k, 270 * k)
+    out = _resize(src, 480, 270, "hızlı")
+    assert np.array_equal(out, src[k // 2::k, k // 2::k])
+
+
+def _dirty_frames(w, h):
+    before = _noise(w, h, seed=1)
+    after = before.copy()
+    rects = [(100, 60, 357, 301), (1501, 803, 1920, 1080), (0, 0, 7, 5)]
+    rng = np.random.default_rng(2)
+    for x0, y0, x1, y1 in rects:
+        after[y0:y1, x0:x1] = rng.integers(0, 256, (y1 - y0, x1 - x0, 4), dtype=np.uint8)
+    return before, after, rects
+
+
+@pytest.mark.parametrize("preset", m.RESIZE_PRESETS)
+@pytest.mark.parametrize("size", [(960, 540), (480, 270), (1000, 562)])
+def test_partial_update_matches_full_resize(preset, size):
+    before, after, rects = _dirty_frames(1920, 1080)
+    small = _resize(before, *size, preset)
+    out, px = m.update_small(after, rects, small, preset)
+    assert np.array_equal(small, _resize(after, *size, preset))
+    assert out is not None and px > 0
+
+
+def test_partial_update_reports_changed_area_at_non_integer_ratio():
+    before, after, rects = _dirty_frames(1920, 1080)
+    small = _resize(before, 1000, 562, "dengeli")
+    ref = small.copy()
+    out, _ = m.update_small(after, rects, small, "dengeli")
+    mask = np.zeros(small.shape[:2], dtype=bool)
+    for x0, y0, x1, y1 in out:
+        mask[y0:y1, x0:x1] = True
+    # bildirilen dikdörtgenlerin dışında hiçbir hedef pikseli değişmemeli
+    assert np.array_equal(small[~mask], ref[~mask])
+
+
+SRC_PX, DST_PX, BUDGET = 1920 * 1080, 960 * 540, 1 / 30
+
+
+def test_auto_never_picks_unmeasured_preset():
+    eng = m.ResizeEngine("otomatik")
+    assert eng.select(SRC_PX, DST_PX, BUDGET) == "hızlı"
+    assert eng.pending_probe == "dengeli"
+    # ölçüm gelmeden seçim değişmez
+    assert eng.select(SRC_PX, DST_PX, BUDGET) == "hızlı"
+    eng.run_probe(_smooth(1920, 1080), 960, 540)
+    assert eng.pending_probe is None
+    assert eng.select(SRC_PX, DST_PX, BUDGET) == "dengeli"
+
+
+def test_auto_falls_back_when_measured_cost_exceeds_budget():
+    eng = m.ResizeEngine("otomatik")
+    eng.select(SRC_PX, DST_PX, BUDGET)
+    eng.observe("dengeli", SRC_PX, 0.001)
+    assert eng.select(SRC_PX, DST_PX, BUDGET) == "dengeli"
+    for _ in range(10):
+        eng.observe("dengeli", SRC_PX, 0.5)    # kare bütçesinin çok üstünde
+    assert eng.select(SRC_PX, DST_PX, BUDGET) == "hızlı"
+
+
+def test_auto_probes_next_preset_and_promotes_within_budget():
+    eng = m.ResizeEngine("otomatik")
+    eng.select(SRC_PX, DST_PX, BUDGET)
+    eng.observe("dengeli", SRC_PX, 0.001)
+    chosen = [eng.select(SRC_PX, DST_PX, BUDGET) for _ in range(m.RESIZE_PROBE_EVERY)]
+    assert set(chosen) == {"dengeli"}
+    assert eng.pending_probe == "yüksek kalite"
+    eng.run_probe(_smooth(1920, 1080), 960, 540)
+    assert eng.pending_probe is None
+    # bol bütçede (1 s/kare) ölçülen üst ön ayar seçilir
+    assert eng.select(SRC_PX, DST_PX, 1.0) == "yüksek kalite"
+
+
+def test_auto_enlarging_and_fixed_modes():
+    assert m.ResizeEngine("otomatik").select(100, 400, BUDGET) == "dengeli"
+    for preset in m.RESIZE_PRESETS:
+        eng = m.ResizeEngine(preset)
+        assert eng.select(SRC_PX, DST_PX, BUDGET) == preset
+        assert eng.pending_probe is None
@@ -0,0 +1,27 @@
+"""Yayın sunucusu: istemci yokken saklanan kare, kaynak tampon yeniden yazılsa da korunur."""
+import urllib.request
+
+import numpy as np
+
+import monitor_preview_tk as m
+
+m.load_dependencies()
+cv2 = m.cv2
+
+
+def test_snapshot_without_clients_survives_buffer_reuse():
+    server = m.PreviewStreamServer(port=0)
+    server.start()
+    try:
+        rgb = np.zeros((90, 160, 3), dtype=np.uint8)
+        rgb[:, :80] = (200, 40, 10)
+        expected = rgb.copy()
+        server.offer(rgb, 0.0)
+        rgb[...] = 255   # havuz tamponu Tk'dan döndü ve worker üzerine yazdı
+        with urllib.request.urlopen(server.url + "frame.jpg", timeout=5) as r:
+            jpeg = r.read()
+        bgr = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        got = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB).astype(np.int16)
+        assert np.abs(got - expected).mean() < 4
+    finally:
+        server.close()